@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+"""Benchmark generate.py on synthetic rosters and templates.
+
+Every stage is timed on its own:
+
+    parse      reading a Raid-Helper export into a Raid
+    build      building the jinja2 environment
+    resolve    finding the players each template refers to
+    compile    the first render of each template, which compiles it
+    render     rendering each template (reported per template too)
+    write      writing the output file
+    batch      rendering every template for many raids, per raid
+
+Rosters have 10, 25 or 40 players cycling through every spec in
+libs.players.roles, and templates use instruct, first, random,
+players_by_class, colortext and raid.getplayers_by_flag. Results are written
+as JSON, and --compare prints how they changed against an earlier run:
+
+    python benchmarks/bench.py --output before.json
+    ... change something ...
+    python benchmarks/bench.py --output after.json --compare before.json"""
+
+import argparse
+import json
+import pathlib
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import generate  # noqa: E402
+from libs import deps, errorlog  # noqa: E402
+from libs.players import ROLE_FLAGS, roles  # noqa: E402
+
+RESULTS_VERSION = 1
+
+
+def parse_cli() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark generate.py on synthetic rosters and templates.")
+    parser.add_argument("--players", type=str, default="10,25,40", help="Roster sizes to run, comma separated.")
+    parser.add_argument("--templates", type=str, default="10,100,1000", help="Template counts to run, comma separated.")
+    parser.add_argument("--raids", type=str, default="1,10,100", help="Raid counts for the batch stage, comma separated.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of each measurement. The median is reported.")
+    parser.add_argument("--output", type=str, default=None, help="Write the results to this JSON file.")
+    parser.add_argument("--compare", type=str, default=None, help="Results JSON of an earlier run to compare against.")
+    return parser.parse_args()
+
+
+def sizes(value: str) -> list[int]:
+    return [int(x) for x in value.split(",") if x]
+
+
+def roster(players: int, seed: int = 0) -> dict:
+    """A Raid-Helper export with players signed up as every spec in turn."""
+    specs = [role.rh_name for role in roles.values()]
+    drop = []
+    for i in range(players):
+        drop.append(
+            {
+                "partyId": i // 5 + 1,
+                "slotId": i % 5 + 1,
+                "class": "Bench",
+                "spec": specs[(i + seed) % len(specs)],
+                "name": f"Player{i}",
+                "signuptime": str(1663322696 + i),
+                "userid": str(100000 + i),
+            }
+        )
+    return {"_id": f"{0x6324c2c6 + seed:08x}0000000000000000", "title": "Benchmark", "raidDrop": drop}
+
+
+def template(i: int, players: int) -> str:
+    """A template using the common helpers, and a few players by name."""
+    flags = ROLE_FLAGS[i % len(ROLE_FLAGS)], ROLE_FLAGS[(i + 3) % len(ROLE_FLAGS)]
+    names = [f"Player{(i * 7 + k) % players}" for k in range(3)]
+    return "\n".join(
+        [
+            f"{{{{ colortext('palevioletred', 'Encounter {i}') }}}}",
+            f"\\n{{skull}} {{{{ first(raid.getplayers_by_flag('{flags[0]}', True)) }}}} {{{{ second(raid.getplayers_by_flag('{flags[0]}', True)) }}}}",
+            f"\\n{{cross}} {{{{ random(raid.getplayers_by_flag('{flags[1]}', True)) }}}}",
+            "\\n{{ instruct(players_by_class('PRIEST'), 'Dispel') }}",
+            f"\\n{{{{ instruct(first('{names[0]}', '{names[1]}'), 'Tank') }}}} {{{{ {names[2]} }}}}",
+            "{% for player in players_by_class('MAGE') %}\\n{{ instruct(player, 'Decurse') }}{% endfor %}",
+        ]
+    )
+
+
+def timed(repeat: int, run) -> float:
+    """Median seconds of run() over repeat runs."""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+
+class Bench:
+    def __init__(self, directory: pathlib.Path, repeat: int):
+        self.directory = directory
+        self.repeat = repeat
+        self.results = []
+
+    def record(self, stage: str, seconds: float, items: int = 1, **params) -> None:
+        self.results.append({"stage": stage, **params, "seconds": seconds, "per_item": seconds / max(items, 1), "items": items})
+        print(f"{stage:8} {' '.join(f'{k}={v}' for k, v in params.items()):30} {seconds * 1000:10.2f} ms  {seconds / max(items, 1) * 1e6:10.1f} us/item")
+
+    def setup(self, players: int, templates: int) -> tuple[argparse.Namespace, list[pathlib.Path]]:
+        case = self.directory / f"p{players}-t{templates}"
+        template_dir = case / "templates"
+        template_dir.mkdir(parents=True, exist_ok=True)
+        for i in range(templates):
+            (template_dir / f"t{i:05}.jinja2").write_text(template(i, players))
+        raid_file = case / "raid.json"
+        raid_file.write_text(json.dumps(roster(players)))
+        args = generate.parse_cli(
+            [
+                "--templates", str(template_dir),
+                "--raid", str(raid_file),
+                "--assignments", str(ROOT / "assignments.yaml"),
+                "--aliases", str(case / "no-aliases.yaml"),
+                "--output", str(case / "output.json"),
+                "--cache-dir", str(case / "cache"),
+                "--manifest", str(case / "manifest.json"),
+                "--seed", "1",
+            ]
+        )
+        return args, generate.find_templates(args.templates)
+
+    def run_case(self, players: int, templates: int) -> None:
+        args, template_files = self.setup(players, templates)
+        aliases = generate.AliasTable.load(args.aliases)
+        params = {"players": players, "templates": templates}
+
+        self.record("parse", timed(self.repeat, lambda: generate.load_raid(args.raid, aliases)), **params)
+        generate.load_inputs(args, aliases)
+        self.record("build", timed(self.repeat, lambda: generate.build_environment(args)), **params)
+        environment = generate.build_environment(args)
+
+        def resolve():
+            generate.template_names_cache.clear()
+            with errorlog.muted():
+                generate.report_missing_players(environment, template_files)
+
+        self.record("resolve", timed(self.repeat, resolve), templates, **params)
+
+        notes = {}
+
+        def render():
+            with errorlog.muted():
+                for template_file in template_files:
+                    notes[template_file] = generate.render_template(environment, template_file).note
+
+        # The first render also compiles each template, later ones use the compiled template.
+        self.record("compile", timed(1, render), templates, **params)
+        self.record("render", timed(self.repeat, render), templates, **params)
+        self.record("write", timed(self.repeat, lambda: generate.write_output(args.output, notes)), templates, **params)
+
+    def run_batch(self, players: int, templates: int, raids: int) -> None:
+        args, template_files = self.setup(players, templates)
+        aliases = generate.AliasTable.load(args.aliases)
+        raid_dir = self.directory / f"raids-p{players}-r{raids}"
+        raid_dir.mkdir(exist_ok=True)
+        for i in range(raids):
+            (raid_dir / f"raid{i:05}.json").write_text(json.dumps(roster(players, seed=i)))
+        raid_files = generate.find_raids(str(raid_dir))
+        args.output = str(self.directory / f"batch-p{players}-r{raids}.json")
+        args.quiet = True
+
+        def batch():
+            with errorlog.muted(), open(self.directory / "batch.log", "w") as log:
+                stdout, sys.stdout = sys.stdout, log
+                try:
+                    generate.batch(args, aliases, raid_files)
+                finally:
+                    sys.stdout = stdout
+
+        self.record("batch", timed(self.repeat, batch), raids, players=players, templates=templates, raids=raids)
+
+
+def compare(results: list[dict], path: str) -> None:
+    with open(path) as f:
+        before = json.load(f)
+    key = lambda x: (x["stage"], x.get("players"), x.get("templates"), x.get("raids"))
+    old = {key(x): x for x in before["results"]}
+    print(f"\nCompared to {path} ({before.get('code')}):")
+    for result in results:
+        previous = old.get(key(result))
+        if previous:
+            change = result["seconds"] / previous["seconds"] - 1 if previous["seconds"] else 0.0
+            params = " ".join(f"{k}={v}" for k, v in zip(("players", "templates", "raids"), key(result)[1:]) if v is not None)
+            print(f"{result['stage']:8} {params:30} {previous['seconds'] * 1000:10.2f} ms -> {result['seconds'] * 1000:10.2f} ms  {change:+7.1%}")
+
+
+def main():
+    args = parse_cli()
+    with tempfile.TemporaryDirectory(prefix="mrt-bench-") as directory:
+        bench = Bench(pathlib.Path(directory), args.repeat)
+        for players in sizes(args.players):
+            for templates in sizes(args.templates):
+                bench.run_case(players, templates)
+        largest = max(sizes(args.players))
+        for raids in sizes(args.raids):
+            bench.run_batch(largest, 10, raids)
+
+    report = {
+        "version": RESULTS_VERSION,
+        "code": deps.code_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": bench.results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        compare(bench.results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,40 @@
 #!/usr/bin/env python
 
+import libs.startup as startup
 import argparse
-import colorama
+import bisect
+import glob
+import hashlib
+import io
 import json
 import functools
-import yaml
-from libs.raid import Raid, load_raid
+from libs.raid import Raid
+from libs.raidhelper import read_raids
 from libs.players import Player, GameClass
-from libs.color import colortext
+from libs.selector import Selector
+from libs.rotation import MODES as ROTATION_MODES, Rotation, raid_key
+from libs.assignments import ALL, Index, Solution, load as load_assignment_file, solve as solve_assignments
+from libs.aliases import AliasTable
+from libs.history import Attendance, History
+from libs.color import colortext, strip_colors
+from libs.output import NoteWriter
+from libs.minify import minify
+from libs.manifest import Manifest, delta_path, diff as diff_notes, write_delta
+from libs.profiler import Profiler
 import libs.errorlog as errorlog
-import jinja2
+import libs.deps as deps
 import pathlib
-import random
-import operator
+import os
+import re
 import sys
+import time
+import typing
 
+# jinja2, yaml and colorama are imported through startup.timed_import when first needed.
+startup.mark("imports")
 
-def parse_cli() -> dict[str, any]:
+
+def parse_cli(argv: list[str] = None) -> dict[str, any]:
     parser = argparse.ArgumentParser(
         description="Generate MRT notes for MRTNoteImporter"
     )
@@ -30,7 +48,7 @@ def parse_cli() -> dict[str, any]:
         "--raid",
         type=str,
         default="raid.json",
-        help="Path to a Raid-Helper raid export JSON file.",
+        help="Path to a Raid-Helper raid export JSON file. A directory or glob renders every export in it, writing one output file per raid.",
     )
     parser.add_argument(
         "--assignments",
@@ -38,30 +56,176 @@ def parse_cli() -> dict[str, any]:
         default="assignments.yaml",
         help="Path to a Raid-Helper raid export JSON file.",
     )
+    parser.add_argument(
+        "--aliases",
+        type=str,
+        default="aliases.yaml",
+        help="Path to a YAML file mapping Raid-Helper signup names to character names.",
+    )
     parser.add_argument(
         "--output",
         type=str,
         default="output.json",
-        help="Output file. Will overwrite if it already exists.",
+        help="Output file. Will overwrite if it already exists. When rendering several raids, outputs go in a directory of this name without the .json.",
+    )
+    parser.add_argument(
+        "--history",
+        type=str,
+        default="history.sqlite",
+        help="SQLite database of past raids, for --ingest and the attendance and played template helpers.",
+    )
+    parser.add_argument(
+        "--ingest",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Add the Raid-Helper exports in a file, directory or glob to --history and exit. Files that were added before and haven't changed are skipped.",
+    )
+    parser.add_argument(
+        "--fair",
+        choices=ROTATION_MODES,
+        default=None,
+        help="Make random and randomList take turns across raids instead of picking at random, by who did the job least recently or least often. Turns are kept in --history. Renders in one process, whatever --jobs is.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Render templates across N processes. 0 uses one per CPU.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Seed for random, weighted and randomList, to pick the same players every run.",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Don't print each note as it is rendered.",
+    )
+    parser.add_argument(
+        "--summary",
+        action="store_true",
+        help="Print the size of each note and how long it took to render, instead of the note.",
+    )
+    parser.add_argument(
+        "--serve",
+        type=str,
+        default=None,
+        metavar="[HOST:]PORT",
+        help="Keep the templates and assignments loaded and render notes for Raid-Helper exports POSTed to http://HOST:PORT/render, across --jobs worker processes. HOST is 127.0.0.1 unless given.",
+    )
+    parser.add_argument(
+        "--errors-json",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Also write the errors to FILE as JSON, with their codes, templates, lines and counts.",
+    )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Time each template and every helper and raid method it calls, and write the report to FILE as JSON, with collapsed stacks for flame graphs next to it in a .folded file. Renders in one process.",
+    )
+    parser.add_argument(
+        "--minify",
+        action="store_true",
+        help="Make notes smaller without changing how they look in game: merge colour codes, drop empty ones and empty {p:} blocks, and trim whitespace at the ends of lines.",
+    )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help="Also write the notes that changed since the last run to a .delta.json file next to the output, with removed notes as empty notes.",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        default=".cache/manifest.json",
+        help="Where the hashes of the notes in each output are kept, for --delta.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running, and update the output whenever a template, the raid or the assignments change.",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=0.05,
+        metavar="SECONDS",
+        help="How often --watch checks for changes.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only render templates whose files, assignments or players changed since the last --incremental run, and reuse the rest of the output file.",
+    )
+    parser.add_argument(
+        "--deps-file",
+        type=str,
+        default=".cache/deps.json",
+        help="Where --incremental keeps what each template depended on.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=".cache/templates",
+        help="Directory to keep compiled templates and assignments in between runs.",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=float,
+        default=64,
+        metavar="MB",
+        help="Remove the least recently used compiled templates when the cache grows past this size.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Compile every template from scratch, without reading or writing the cache.",
+    )
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="Print how long startup took, and the cost of each import.",
+    )
+    parser.add_argument(
+        "--startup-budget",
+        type=float,
+        default=None,
+        metavar="MS",
+        help="Exit with an error if imports took longer than this many milliseconds.",
+    )
+    return parser.parse_args(argv)
 
 def set_default(obj):
     if isinstance(obj, set):
         return list(obj)
     raise TypeError
 
-def load_raid(raid_json: str) -> Raid:
-    new_raid = Raid()
-    for player_json in json.loads(raid_json)["raidDrop"]:
-        if player_json["name"]:
-            player = Player(name=player_json["name"], rh_string=player_json["spec"])
-            new_raid.add_player(player)
+def load_raid(path: str, aliases: AliasTable = None) -> Raid:
+    """The first raid in a Raid-Helper export file, see libs/raidhelper.py."""
+    with open(path, "rb") as f:
+        raids = read_raids(f, aliases)
+        new_raid = next(raids, None)
+        if new_raid is None:
+            raise ValueError(f"{path} has no raids in it")
+        if next(raids, None) is not None:
+            errorlog.add(
+                f"{path} has more than one raid in it, only the first was used. Pass its directory to --raid to render them all.",
+                code=errorlog.INPUT,
+            )
     return new_raid
 
 
-def load_assignments(assignments_yaml: str) -> dict[str, any]:
-    return yaml.safe_load(assignments_yaml)
+def load_assignments(args) -> tuple[dict[str, any], Index]:
+    """The assignments and their compiled index, see libs/assignments.py."""
+    cache_dir = None if args.no_cache else pathlib.Path(args.cache_dir) / "assignments"
+    return load_assignment_file(args.assignments, cache_dir)
 
 
 def instruct(player: Player | str | list[Player | str], instruction: str):
@@ -72,148 +236,109 @@ def instruct(player: Player | str | list[Player | str], instruction: str):
         return f"{{p:{x}}}{{spell:71299}} {instruction}{{/p}}"
 
 
-def recursive_get(d, l):
-    """Iterate nested dictionary"""
-    return functools.reduce(operator.getitem, l, d)
+def nth(k: int, *players: Player | str | tuple[Player], errors: bool = True) -> Player:
+    return selector.nth(k, *players, errors=errors)
 
 
 def first(*players: Player | str | tuple[Player], errors: bool = True) -> Player:
-    original_players = players
-    if isinstance(players, tuple):
-        if isinstance(players[0], list):
-            players = players[0]
-    for player in players:
-        if isinstance(player, str) and raid.getplayer_by_name(player, errors=False):
-            return raid.getplayer_by_name(player)
-        if isinstance(player, Player):
-            return player
-
-    # Bad if we get here
-    if errors:
-        errorlog.add(
-            f"first{original_players} was called, but none of those people are in the raid"
-        )
-    return "MISSING_PLAYER"
+    return selector.nth(1, *players, errors=errors)
 
 
 def second(*players: Player | str | tuple[Player], errors: bool = True) -> Player:
-    original_players = players
-    if isinstance(players, tuple):
-        if isinstance(players[0], list):
-            players = players[0]
-    for player in players[1:]:
-        if isinstance(player, str) and raid.getplayer_by_name(player, errors=False):
-            return raid.getplayer_by_name(player)
-        if isinstance(player, Player):
-            return player
-
-    # Bad if we get here
-    if errors:
-        errorlog.add(
-            f"second{original_players} was called, but none of those people are in the raid"
-        )
-    return "MISSING_PLAYER"
+    return selector.nth(2, *players, errors=errors)
+
 
 def third(*players: Player | str | tuple[Player], errors: bool = True) -> Player:
-    original_players = players
-    if isinstance(players, tuple):
-        if isinstance(players[0], list):
-            players = players[0]
-    for player in players[2:]:
-        if isinstance(player, str) and raid.getplayer_by_name(player, errors=False):
-            return raid.getplayer_by_name(player)
-        if isinstance(player, Player):
-            return player
-
-    # Bad if we get here
-    if errors:
-        errorlog.add(
-            f"third{original_players} was called, but none of those people are in the raid"
-        )
-    return "MISSING_PLAYER"
+    return selector.nth(3, *players, errors=errors)
+
 
 def fourth(*players: Player | str | tuple[Player], errors: bool = True) -> Player:
-    original_players = players
-    if isinstance(players, tuple):
-        if isinstance(players[0], list):
-            players = players[0]
-    for player in players[3:]:
-        if isinstance(player, str) and raid.getplayer_by_name(player, errors=False):
-            return raid.getplayer_by_name(player)
-        if isinstance(player, Player):
-            return player
-
-    # Bad if we get here
-    if errors:
-        errorlog.add(
-            f"fourth{original_players} was called, but none of those people are in the raid"
-        )
-    return "MISSING_PLAYER"
+    return selector.nth(4, *players, errors=errors)
+
 
 def fifth(*players: Player | str | tuple[Player], errors: bool = True) -> Player:
-    original_players = players
-    if isinstance(players, tuple):
-        if isinstance(players[0], list):
-            players = players[0]
-    for player in players[4:]:
-        if isinstance(player, str) and raid.getplayer_by_name(player, errors=False):
-            return raid.getplayer_by_name(player)
-        if isinstance(player, Player):
-            return player
-
-    # Bad if we get here
-    if errors:
-        errorlog.add(
-            f"fifth{original_players} was called, but none of those people are in the raid"
-        )
-    return "MISSING_PLAYER"
+    return selector.nth(5, *players, errors=errors)
 
-def rand(*players: Player | str | tuple[Player], errors: bool = True) -> Player:
-    original_players = players
-    if isinstance(players, tuple):
-        if isinstance(players[0], list):
-            players = players[0]
 
-    ret = first(random.sample(players, k=len(players)), errors=False)
-    if ret != "MISSING_PLAYER":
-        return ret
-    else:
-        if errors:
-            errorlog.add(
-                f"random{players} was called, but none of those people are in the raid"
-            )
-    return "MISSING_PLAYER"
+def rand(*players: Player | str | tuple[Player], errors: bool = True, job: str = None) -> Player:
+    site = call_site("random")
+    if job is None and selector.rotation:
+        job = site
+    return selector.random(*players, errors=errors, job=job, site=site)
 
-def randClasses():
-    classes = {}
-    for gc in GameClass:
-        classes[gc] = random.sample(raid.getplayers(gc), k=len(raid.getplayers(gc)))
-    return classes
 
-def randList(gameclass: GameClass, randClasses) -> list[Player]:
-    players = randClasses.get(gameclass, [])
-    return players
+def weighted(weights: dict[Player | str, float], errors: bool = True) -> Player:
+    return selector.weighted(weights, errors=errors, site=call_site("weighted"))
 
-def assign(ass: str) -> Player:
-    if "/" in ass:
-        path = ass.split("/")
-        r = recursive_get(assignments, path)
-        if r.get("name"):
-            return raid.getplayer_by_name(r["name"])
-        if r.get("class") and not r.get("spec"):
-            return raid.getplayers_by_classspec(gameclass=GameClass(r.get("class")))
-        if r.get("class") and r.get("spec"):
-            return raid.getplayers_by_classspec(
-                gameclass=GameClass(r.get("class"), spec=Spec(r.get("spec")))
-            )
 
-    else:
-        try:
-            return raid.getplayer_by_name(ass)
-        except KeyError:
-            errorlog.add(
-                "In assignment {assignment} there is a player called {assignment['name']}, but that player is not in the raid."
-            )
+def randList(gameclass: GameClass, job: str = None) -> list[Player]:
+    return selector.pool(gameclass, job)
+
+
+# The template being rendered, and how many times each helper has been called in it, see call_site.
+rendering = {"template": None, "calls": {}}
+
+
+def call_site(helper: str) -> str:
+    """Names a helper call by its template and how many calls to the helper came before it,
+    e.g. "MC - 2:random:1", which random and weighted pick once for, and the default --fair job."""
+    calls = rendering["calls"]
+    calls[helper] = calls.get(helper, 0) + 1
+    return f"{rendering['template']}:{helper}:{calls[helper]}"
+
+
+# The --fair ledger, shared by every raid rendered in this process.
+rotation = None
+
+
+def make_selector(args) -> Selector:
+    """A Selector for the current raid, taking turns from the --fair ledger if asked to."""
+    global rotation
+    if not args.fair:
+        return Selector(raid, args.seed)
+    if rotation is None:
+        rotation = Rotation(args.history, args.fair)
+    rotation.begin(raid_key(raid.export_id, [x.name for x in raid.players]))
+    return Selector(raid, args.seed, rotation)
+
+
+def solved() -> Solution:
+    """The assignments solved for the current raid, see libs/assignments.py."""
+    global solution
+    if solution is None:
+        solution = solve_assignments(assignment_index, raid)
+    return solution
+
+
+def report_unfilled_slots() -> None:
+    for message in solved().messages():
+        errorlog.add(message, code=errorlog.ASSIGNMENT)
+
+
+def assign(ass: str) -> Player | list[Player]:
+    """The player or players assigned to encounter/job in the assignments, or the player called ass."""
+    if "/" not in ass:
+        return raid.getplayer_by_name(ass)
+
+    path = ass.split("/")
+    # The solution depends on the whole encounter section, the all: section and who is in the raid.
+    for section in (path[0], ALL):
+        deps.record_assignment([section], deps.lookup_assignment(assignments or {}, [section]))
+    deps.record_roster("players", None, None, raid.players)
+    slot = assignment_index.slots.get(tuple(path))
+    if slot:
+        players = solved().filled[slot.encounter, slot.job]
+        if slot.name:
+            return players[0] if players else "MISSING_PLAYER"
+        return players
+
+    value = assignment_index.values.get(ass)
+    if value is None:
+        errorlog.add("assign(\"{}\") was called, but there is no such assignment.", ass, code=errorlog.ASSIGNMENT)
+        return "MISSING_PLAYER"
+    if isinstance(value, str):
+        return raid.getplayer_by_name(value)
+    return value
 
 
 def players_by_class(gcs: str):
@@ -224,86 +349,746 @@ def players_by_spec(gcs: str, gss: str):
     return raid.getplayers(gcs, gss)
 
 
-def newline_stripping_loader(filename: str) -> str:
-    with open(filename) as f:
-        template = f.read()
-        template = template.replace("\n", "")
-        template = template.replace(r"\n", "\n")
-        return template
+def attendance(player: Player | str, last: int = None) -> Attendance:
+    """How many of the last raids in the history (or all of them) player was in."""
+    deps.record_file(str(history.path))
+    if not history.exists():
+        errorlog.add(
+            "attendance({}) was called, but there is no history in {}. Use --ingest to add raids to it.",
+            player,
+            history.path,
+            code=errorlog.NO_HISTORY,
+        )
+        return Attendance(0, 0)
+    return history.attendance(strip_colors(str(player)), last)
 
 
-class Undefined(jinja2.Undefined):
-    def __str__(self):
+def played(gameclass: str, spec: str = None, last: int = None) -> list[str]:
+    """Everyone who played a class (and spec) in the last raids in the history, most recent first."""
+    deps.record_file(str(history.path))
+    if not history.exists():
         errorlog.add(
-            f"Tried to use {{{ {self._undefined_name} }}}, but that player isn't in the raid."
+            "played({}, {}) was called, but there is no history in {}. Use --ingest to add raids to it.",
+            gameclass,
+            spec,
+            history.path,
+            code=errorlog.NO_HISTORY,
         )
-        return "MISSING_DATA"
+        return []
+    return history.played(gameclass, spec, last)
 
-def main():
-    # Parse CLI.
-    args = parse_cli()
 
-    # Load the data on who is in the raid.
-    with open(args.raid, "r") as f:
-        global raid
-        raid = load_raid(f.read())
+# Whitespace and {# comments #}, which are skipped to find where a line of a template really starts.
+LEADING_FILLER = re.compile(r"(?:\s|\{#.*?#\})*")
 
-    # Load the assignments
-    with open(args.assignments, "r") as f:
-        global assignments
-        assignments = load_assignments(f.read())
 
-    # Build the jinja2 environment
+def strip_newlines(source: str) -> tuple[str, list[int]]:
+    """source with its newlines removed and each literal \\n turned into a newline, and for each
+    line of the result, the line of source its first text other than whitespace or comments is on."""
+    lines = source.split("\n")
+    # Where each line of source starts once the newlines are removed.
+    starts = [0]
+    for line in lines[:-1]:
+        starts.append(starts[-1] + len(line))
+    stripped = "".join(lines)
+    breaks = [m.end() for m in re.finditer(r"\\n", stripped)]
+    source_lines = []
+    for start, end in zip([0, *breaks], [*breaks, len(stripped)]):
+        text = LEADING_FILLER.match(stripped, start, end).end()
+        source_lines.append(bisect.bisect_right(starts, text if text < end else start))
+    return stripped.replace(r"\n", "\n"), source_lines
+
+
+def newline_stripping_loader(filename: str) -> tuple[str, str, callable]:
+    mtime = os.path.getmtime(filename)
+    deps.record_file(filename)
+    with open(filename) as f:
+        template, errorlog.source_lines[filename] = strip_newlines(f.read())
+
+    # Templates loaded by the environment are reused until the file changes.
+    def uptodate() -> bool:
+        deps.record_file(filename)
+        return os.path.getmtime(filename) == mtime
+
+    return template, filename, uptodate
+
+
+@functools.cache
+def undefined_type() -> type:
+    jinja2 = startup.timed_import("jinja2")
+
+    class Undefined(jinja2.Undefined):
+        def __str__(self):
+            # A player used where template_names didn't see them, e.g. in a macro imported
+            # without context, or a template included by a name worked out while rendering.
+            if self._undefined_obj is jinja2.utils.missing:
+                player = raid.getplayer_by_name(self._undefined_name, errors=False)
+                if player:
+                    return player.color_name()
+            errorlog.add(MISSING_PLAYER_MESSAGE, self._undefined_name, code=errorlog.MISSING_PLAYER)
+            return "MISSING_DATA"
+
+    return Undefined
+
+
+@functools.cache
+def missing_player_type() -> type:
+    """Stands in for a player a template refers to who isn't in the raid. They are reported
+    by report_missing_players before rendering, so this doesn't log anything."""
+
+    class MissingPlayer(undefined_type()):
+        def __str__(self):
+            return "MISSING_DATA"
+
+    return MissingPlayer
+
+
+MISSING_PLAYER_MESSAGE = "Tried to use {{{{ {} }}}}, but that player isn't in the raid."
+
+
+# (cache key of the template source) -> what template_names found in it.
+template_names_cache = {}
+# Names jinja2 defines inside loops, macros and blocks.
+JINJA_NAMES = {"loop", "caller", "varargs", "kwargs", "self", "super"}
+
+
+def parse_names(environment, name: str) -> dict[str, list[str]]:
+    """The names a template uses ("used") and sets ("set"), and the templates it includes,
+    imports or extends by name ("templates"). Found by parsing the template once and
+    cached with the compiled templates."""
+    source = environment.loader.get_source(environment, name)[0]
+    cache = environment.bytecode_cache
+    key = cache.key(environment, source) if cache else hashlib.sha256(source.encode()).hexdigest()
+    found = template_names_cache.get(key)
+    if found is None and cache:
+        found = cache.load_names(key)
+    if not isinstance(found, dict):
+        nodes = startup.timed_import("jinja2.nodes")
+        parsed = environment.parse(source)
+        used, local = set(), set()
+        for node in parsed.find_all(nodes.Name):
+            (used if node.ctx == "load" else local).add(node.name)
+        for node in parsed.find_all(nodes.Macro):
+            local.add(node.name)
+        templates = set()
+        for node in parsed.find_all((nodes.Include, nodes.Import, nodes.FromImport, nodes.Extends)):
+            # {% include "a" %}, or a list of templates to try, {% include ["a", "b"] %}.
+            for x in node.template.items if isinstance(node.template, (nodes.List, nodes.Tuple)) else [node.template]:
+                if isinstance(x, nodes.Const) and isinstance(x.value, str):
+                    templates.add(x.value)
+            if isinstance(node, nodes.Import):
+                local.add(node.target)
+            elif isinstance(node, nodes.FromImport):
+                local.update(x if isinstance(x, str) else x[1] for x in node.names)
+        found = {"used": sorted(used - JINJA_NAMES), "set": sorted(local), "templates": sorted(templates)}
+        if cache:
+            cache.dump_names(key, found)
+    template_names_cache[key] = found
+    return found
+
+
+def template_names(environment, template_file: pathlib.Path) -> list[str]:
+    """The names a template, or a template it includes, imports or extends, uses that aren't
+    helpers or set in one of them, i.e. the players it refers to."""
+    jinja2 = startup.timed_import("jinja2")
+    used, local = set(), set()
+    seen = set()
+    pending = [str(template_file)]
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        try:
+            found = parse_names(environment, name)
+        except (OSError, jinja2.TemplateNotFound):
+            # A template included that doesn't exist is an error when rendering instead.
+            if seen:
+                continue
+            raise
+        seen.add(name)
+        used.update(found["used"])
+        local.update(found["set"])
+        pending.extend(found["templates"])
+    return [name for name in sorted(used - local) if name not in environment.globals]
+
+
+def player_vars(environment, template_file: pathlib.Path) -> dict[str, any]:
+    """The players a template refers to by name, looked up in the raid."""
+    players = {}
+    for name in template_names(environment, template_file):
+        player = raid.getplayer_by_name(name, errors=False)
+        players[name] = player.color_name() if player else missing_player_type()(name=name)
+    return players
+
+
+def report_missing_players(environment, template_files: list[pathlib.Path]) -> None:
+    """Log every player a template refers to who isn't in the raid, before anything is rendered."""
+    for template_file in template_files:
+        for name in template_names(environment, template_file):
+            if not raid.getplayer_by_name(name, errors=False):
+                errorlog.add(MISSING_PLAYER_MESSAGE, name, code=errorlog.MISSING_PLAYER, template=template_file.stem)
+
+def build_environment(args):
+    """Build the jinja2 environment, with the helpers bound to the current raid and assignments."""
+    jinja2 = startup.timed_import("jinja2")
+    bytecode_cache = None
+    if not args.no_cache:
+        from libs.templatecache import TemplateCache
+
+        bytecode_cache = TemplateCache(args.cache_dir, max_bytes=int(args.cache_size * 1024 * 1024))
     environment = jinja2.Environment(
         loader=jinja2.FunctionLoader(newline_stripping_loader),
         trim_blocks=True,
         line_comment_prefix="#",
         line_statement_prefix=None,
-        undefined=Undefined,
+        undefined=undefined_type(),
+        bytecode_cache=bytecode_cache,
     )
+    global history
+    history = History(args.history)
+    bind_globals(environment)
+    return environment
+
 
+def bind_globals(environment) -> None:
+    """Point the environment's globals at the current raid and assignments."""
     environment.globals["raid"] = raid
     environment.globals["instruct"] = instruct
     environment.globals["colortext"] = colortext
     environment.globals["assignments"] = assignments
     environment.globals["assign"] = assign
+    environment.globals["nth"] = nth
     environment.globals["first"] = first
     environment.globals["second"] = second
     environment.globals["third"] = third
     environment.globals["fourth"] = fourth
     environment.globals["fifth"] = fifth
     environment.globals["random"] = rand
+    environment.globals["weighted"] = weighted
     environment.globals["players_by_class"] = players_by_class
     environment.globals["players_by_spec"] = players_by_spec
-    classes = randClasses()
-    environment.globals["randomList"] = lambda gcs: randList(gcs, classes)
+    environment.globals["attendance"] = attendance
+    environment.globals["played"] = played
+    environment.globals["randomList"] = randList
+    if profiler is not None:
+        profiler.instrument(environment.globals)
 
-    for player in raid.players:
-        environment.globals[player.name] = player.color_name()
 
 
-    # Read and render each template (except the header)
-    template_files = [
-        x for x in pathlib.Path(args.templates).glob("**/*") if x.is_file()
-    ]
+class Rendered(typing.NamedTuple):
+    note: str
+    # Errors logged while rendering the template.
+    errors: list[errorlog.Error]
+    # What the template depended on, for --incremental, if recorded.
+    dependencies: dict | None
+    seconds: float
+
+
+# Times templates and helpers for --profile, see libs/profiler.py.
+profiler = None
+
+
+def render(template, template_file: pathlib.Path, environment) -> str:
+    if profiler is None:
+        return template.render(raid=raid, **player_vars(environment, template_file))
+    return profiler.render(template_file.stem, template, raid=profiler.raid(raid), **player_vars(environment, template_file))
+
+
+def render_template(environment, template_file: pathlib.Path, record: bool = False) -> Rendered:
+    """Render one template, recording what it depended on if record is set."""
+    started = time.perf_counter()
+    rendering["template"] = template_file.stem
+    rendering["calls"].clear()
+    # Errors are counted once per template, and added to the error log when it's done.
+    with errorlog.scope() as errors:
+        if not record:
+            template = environment.get_template(str(template_file))
+            note = render(template, template_file, environment)
+            return Rendered(note, list(errors), None, time.perf_counter() - started)
+
+        with deps.recording() as recorder:
+            deps.record_file(str(template_file))
+            template = environment.get_template(str(template_file))
+            note = render(template, template_file, environment)
+        return Rendered(note, list(errors), recorder.to_json(list(errors)), time.perf_counter() - started)
+
+
+# The environment of a --jobs worker process, see init_worker.
+worker_environment = None
+
+
+def init_worker(args, worker_raid: Raid, worker_assignments: dict, worker_index: Index, seed: int, worker_rotation: Rotation):
+    """Warm up a --jobs worker with the raid, assignments and random seed of the parent,
+    so it renders exactly what a serial run would."""
+    global raid, assignments, assignment_index, selector, solution, worker_environment
+    raid = worker_raid
+    assignments = worker_assignments
+    assignment_index = worker_index
+    selector = Selector(raid, seed, worker_rotation)
+    solution = None
+    worker_environment = build_environment(args)
+
+
+def render_in_worker(template_file: pathlib.Path, record: bool = False) -> Rendered:
+    return render_template(worker_environment, template_file, record)
+
+
+def render_templates(args, environment, template_files: list[pathlib.Path]):
+    """Yield (template_file, Rendered) in template_files order, rendering across args.jobs
+    processes. Errors from workers are added to the error log in the same order too."""
+    jobs = args.jobs or os.cpu_count()
+    if jobs <= 1 or len(template_files) <= 1:
+        for template_file in template_files:
+            yield template_file, render_template(environment, template_file, args.incremental)
+        return
+
+    import concurrent.futures
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=min(jobs, len(template_files)),
+        initializer=init_worker,
+        initargs=(args, raid, assignments, assignment_index, selector.seed, selector.rotation),
+    ) as pool:
+        rendered = pool.map(functools.partial(render_in_worker, record=args.incremental), template_files)
+        for template_file, result in zip(template_files, rendered):
+            for error in result.errors:
+                errorlog.add(error)
+            yield template_file, result
+
+
+def load_inputs(args, aliases: AliasTable) -> None:
+    """Load the raid and assignments into the globals the template helpers use."""
+    global raid, assignments, assignment_index, selector, solution
+
+    # Load the data on who is in the raid.
+    raid = load_raid(args.raid, aliases)
+
+    # Load the assignments
+    assignments, assignment_index = load_assignments(args)
+
+    # Record what templates use, to know what to render next time.
+    if args.incremental:
+        raid = deps.RecordingRaid(raid)
+        assignments = deps.RecordingAssignments(assignments or {})
+
+    selector = make_selector(args)
+    solution = None
+
+
+def find_raids(path: str) -> list[pathlib.Path] | None:
+    """The raid exports --raid refers to, or None if it is a single file."""
+    if os.path.isdir(path):
+        return sorted(x for x in pathlib.Path(path).glob("**/*.json") if x.is_file())
+    if glob.has_magic(path):
+        return sorted(pathlib.Path(x) for x in glob.glob(path, recursive=True) if os.path.isfile(x))
+    return None
+
+
+def batch_outputs(output: str, raid_files: list[pathlib.Path]) -> dict[pathlib.Path, pathlib.Path]:
+    """One output file per raid export, named after the export, in a directory named after output."""
+    directory = pathlib.Path(output)
+    if directory.suffix == ".json":
+        directory = directory.with_suffix("")
+    outputs = {}
+    for raid_file in raid_files:
+        name = raid_file.stem
+        if any(x.stem == name for x in outputs):
+            name = f"{raid_file.parent.name}-{name}"
+        outputs[raid_file] = directory / f"{name}.json"
+    return outputs
+
+
+def read_raid_file(raid_file: pathlib.Path, aliases: AliasTable, failed: list) -> typing.Iterator[Raid]:
+    """The raids in an export file. If it turns out not to be a Raid-Helper export, it is
+    added to failed and no more are read from it. Errors rendering them aren't caught."""
+    with open(raid_file, "rb") as f:
+        try:
+            yield from read_raids(f, aliases)
+        except (ValueError, KeyError, TypeError) as e:
+            failed.append((raid_file, e))
+
+
+def batch(args, aliases: AliasTable, raid_files: list[pathlib.Path]) -> None:
+    """Render every template against each raid export, sharing one environment and its compiled templates."""
+    global raid, assignments, assignment_index, selector, solution
+    assignments, assignment_index = load_assignments(args)
+    raid = Raid()
+    selector = Selector(raid, args.seed)
+    solution = None
+    environment = build_environment(args)
+    template_files = find_templates(args.templates)
     if not template_files:
+        colorama = startup.timed_import("colorama")
         print(
             f"{colorama.Fore.RED}*** ERROR: No template files found in {args.templates} ***{colorama.Style.RESET_ALL}"
         )
         sys.exit(1)
 
-    y = {}
+    outputs = batch_outputs(args.output, raid_files)
+    manifest = Manifest(args.manifest)
+    seen = {}
+    empty, duplicates, failed, rendered = [], [], [], []
+    errors = {}
+    startup.mark("ready to render")
+    for raid_file in raid_files:
+        if os.path.getsize(raid_file) == 0:
+            empty.append(raid_file)
+            continue
+        with open(raid_file, "rb") as f:
+            digest = hashlib.file_digest(f, "sha1").hexdigest()
+        if digest in seen:
+            duplicates.append((raid_file, seen[digest]))
+            continue
+        seen[digest] = raid_file
+        # A file can hold several exports. The second and later ones get numbered outputs.
+        for number, raid in enumerate(read_raid_file(raid_file, aliases, failed), 1):
+            name, output = raid_file.name, outputs[raid_file]
+            if number > 1:
+                name = f"{raid_file.name} #{number}"
+                output = output.with_name(f"{output.stem}-{number}.json")
+            selector = make_selector(args)
+            solution = None
+            bind_globals(environment)
+
+            with errorlog.scope(keep=False) as raid_errors:
+                report_missing_players(environment, template_files)
+                report_unfilled_slots()
+                output.parent.mkdir(parents=True, exist_ok=True)
+                minified = 0
+                with NoteWriter(output, manifest.hashes(output)) as writer:
+                    for template_file, result in render_templates(args, environment, template_files):
+                        note = output_note(args, result.note)
+                        minified += len(result.note.encode()) - len(note.encode())
+                        writer.write(template_file.stem, note)
+            errors[name] = list(raid_errors)
+            rendered.append(name)
+            saved = f", {minified} bytes minified" if args.minify else ""
+            print(f"{name} -> {output} ({len(raid.players)} players, {len(errors[name])} errors{saved})")
+            record_output(args, manifest, output, writer)
+
+    manifest.save()
+    print("===========================================")
+    print(f"Rendered {len(template_files)} templates for {len(rendered)} raids from {len(raid_files)} files.")
+    for raid_file in empty:
+        print(f"Skipped {raid_file}: the file is empty.")
+    for raid_file, original in duplicates:
+        print(f"Skipped {raid_file}: it is the same export as {original}.")
+    for raid_file, e in failed:
+        print(f"Skipped {raid_file}: not a Raid-Helper export ({e!r}).")
+    for name in rendered:
+        for error in errors[name]:
+            error.raid = name
+            errorlog.add(error)
+    errorlog.show()
+
+
+def find_templates(templates: str) -> list[pathlib.Path]:
+    return [x for x in pathlib.Path(templates).glob("**/*") if x.is_file()]
+
+
+def record_output(args, manifest: Manifest, output: str | pathlib.Path, writer: NoteWriter) -> None:
+    """Put the hashes of the notes just written to output in the manifest, and write the --delta file.
+    The delta is against the hashes the writer was given, since output has already been replaced."""
+    delta = diff_notes(writer.previous, writer.hashes)
+    manifest.update(output, writer.hashes)
+    if args.delta:
+        path = delta_path(output)
+        write_delta(path, writer.moved, delta)
+        print(f"{output}: {delta}. Delta written to {path}")
+    if not writer.changed:
+        print(f"{output} is unchanged, so it wasn't rewritten.")
+
+
+def output_note(args, note: str) -> str:
+    """A note as it goes in the output, minified for --minify, see libs/minify.py."""
+    return minify(note) if args.minify else note
+
+
+def write_output(path: str, notes: dict[pathlib.Path, str]) -> None:
+    with NoteWriter(path) as writer:
+        for template_file, x in notes.items():
+            writer.write(pathlib.Path(template_file).stem, x)
+
+
+def watch(args, aliases: AliasTable, environment, notes: dict[pathlib.Path, str], dependencies: dict) -> None:
+    """Re-render the templates affected by each change to the templates, raid or assignments,
+    and rewrite the output, until interrupted."""
+    from libs import watch as watcher
+
+    inputs = {pathlib.Path(args.raid), pathlib.Path(args.assignments)}
+    list_paths = lambda: [*inputs, *find_templates(args.templates)]
+    snapshot = watcher.snapshot(list_paths())
+    print(f"Watching {args.templates}, {args.raid} and {args.assignments}. Press Ctrl+C to stop.")
+    while True:
+        try:
+            changed, snapshot = watcher.wait_for_changes(list_paths, snapshot, args.watch_interval)
+        except KeyboardInterrupt:
+            return
+        started = time.perf_counter()
+        inputs_changed = bool(changed & inputs)
+        if inputs_changed:
+            try:
+                load_inputs(args, aliases)
+            except Exception as e:
+                print(f"Could not reload the raid or assignments: {e}")
+                continue
+            bind_globals(environment)
+
+        # Templates that are new, edited, or whose assignments or players changed.
+        template_files = find_templates(args.templates)
+        affected = [
+            x
+            for x in template_files
+            if x in changed
+            or str(x) not in dependencies
+            or not deps.is_current(dependencies[str(x)], raid, assignments, volatile_ok=not inputs_changed)
+        ]
+        with errorlog.muted():
+            for template_file in affected:
+                try:
+                    result = render_template(environment, template_file, record=True)
+                    notes[template_file] = output_note(args, result.note)
+                    dependencies[str(template_file)] = result.dependencies
+                except Exception as e:
+                    print(f"Could not render {template_file}: {e}")
+                    dependencies.pop(str(template_file), None)
+        for template_file in set(notes) - set(template_files):
+            del notes[template_file]
+            dependencies.pop(str(template_file), None)
+
+        write_output(args.output, {x: notes[x] for x in template_files if x in notes})
+        deps.save_state(args.deps_file, args.output, dependencies, args.minify)
+        took = (time.perf_counter() - started) * 1000
+        print(f"Rendered {len(affected)} of {len(template_files)} templates in {took:.0f} ms: {', '.join(x.stem for x in affected)}")
+        report_missing_players(environment, template_files)
+        report_unfilled_slots()
+        for template_file in template_files:
+            for error in dependencies.get(str(template_file), {}).get("errors", []):
+                errorlog.add(errorlog.Error.from_json(error))
+        errorlog.show()
+        errorlog.fetch().clear()
+
+
+# What --serve workers render with, see serve.
+serving = {"args": None, "aliases": None, "templates": []}
+
+
+def init_server_worker(args, aliases: AliasTable, template_files: list[pathlib.Path]) -> None:
+    """Load the assignments and compile the templates in a --serve worker that wasn't forked from a warm server."""
+    global raid, assignments, assignment_index, selector, solution, worker_environment
+    assignments, assignment_index = load_assignments(args)
+    raid = Raid()
+    selector = Selector(raid, args.seed)
+    solution = None
+    worker_environment = build_environment(args)
+    serving.update(args=args, aliases=aliases, templates=template_files)
     for template_file in template_files:
-        template = environment.get_template(str(template_file))
-        x = template.render(raid=raid)
-        print("===========================================")
-        print(x)
-        y[str(pathlib.Path(template_file).stem)] = x
+        worker_environment.get_template(str(template_file))
+
+
+def render_request(body: bytes) -> tuple[str, list[dict]]:
+    """The MRTNoteImporter JSON and errors for the first raid in a Raid-Helper export, in a --serve worker."""
+    global raid, selector, solution
+    with errorlog.scope(keep=False) as errors:
+        raids = read_raids(io.BytesIO(body), serving["aliases"])
+        raid = next(raids, None)
+        if raid is None:
+            raise ValueError("the request has no raid in it")
+        selector = make_selector(serving["args"])
+        solution = None
+        bind_globals(worker_environment)
+        report_missing_players(worker_environment, serving["templates"])
+        report_unfilled_slots()
+        notes = {x.stem: output_note(serving["args"], render_template(worker_environment, x).note) for x in serving["templates"]}
+    # The same layout as NoteWriter.
+    return json.dumps(notes, separators=(",", ": ")), [x.to_json() for x in errors]
+
 
-    #y = json.dumps(y, default=set_default)
-    with open('output.json', 'w') as f:
-        json.dump(y,f, separators=(',', ': ')) 
+def serve(args, aliases: AliasTable) -> None:
+    """Render notes for exports sent over HTTP until interrupted, see libs/serve.py."""
+    import gc
+    import multiprocessing
+    from libs import serve as server
+
+    template_files = find_templates(args.templates)
+    if not template_files:
+        colorama = startup.timed_import("colorama")
+        print(
+            f"{colorama.Fore.RED}*** ERROR: No template files found in {args.templates} ***{colorama.Style.RESET_ALL}"
+        )
+        sys.exit(1)
+    jobs = args.jobs or os.cpu_count()
+    address = server.parse_address(args.serve)
+
+    # Compile everything once, then fork the workers so they share it copy-on-write.
+    # Where fork isn't available, each worker loads and compiles it for itself.
+    forked = "fork" in multiprocessing.get_all_start_methods()
+    if forked:
+        init_server_worker(args, aliases, template_files)
+        # Keep the garbage collector from writing to the shared pages.
+        gc.freeze()
+        pool = multiprocessing.get_context("fork").Pool(jobs)
+    else:
+        pool = multiprocessing.Pool(jobs, initializer=init_server_worker, initargs=(args, aliases, template_files))
+
+    render = lambda body: pool.apply(render_request, (body,))
+    info = {"templates": len(template_files), "workers": jobs}
+    with pool, server.make_server(address, render, info) as httpd:
+        print(f"Serving {len(template_files)} templates on http://{address[0]}:{httpd.server_port}/render with {jobs} workers. Press Ctrl+C to stop.")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def save_profile(args) -> None:
+    if profiler is None:
+        return
+    folded = profiler.save(args.profile)
+    if not args.quiet:
+        profiler.show()
+    print(f"Profile written to {args.profile}, stacks to {folded}")
+
+
+def ingest(args, aliases: AliasTable) -> None:
+    """Add the exports --ingest refers to to the history database."""
+    paths = find_raids(args.ingest) or [pathlib.Path(args.ingest)]
+    started = time.perf_counter()
+    result = History(args.history).ingest(paths, aliases)
+    took = time.perf_counter() - started
+    print(
+        f"Ingested {result.raids} raids from {result.files - result.unchanged - len(result.failed)} files into {args.history} in {took:.2f} s."
+        f" {result.unchanged} files were unchanged, {result.duplicates} raids were already there."
+    )
+    for path, e in result.failed:
+        print(f"Skipped {path}: not a Raid-Helper export ({e!r}).")
+
+
+def main():
+    # Parse CLI.
+    args = parse_cli()
+    if args.watch:
+        args.incremental = True
+    if args.profile:
+        global profiler
+        profiler = Profiler()
+        # Workers would each have their own timings.
+        args.jobs = 1
+    if args.fair:
+        # Turns are taken in the order templates are rendered, workers would each take their own.
+        args.jobs = 1
+
+    # Load the raid and assignments.
+    aliases = AliasTable.load(args.aliases)
+    if args.ingest:
+        ingest(args, aliases)
+        return
+    if args.serve:
+        serve(args, aliases)
+        return
+    raid_files = find_raids(args.raid)
+    if raid_files is not None:
+        if args.watch or args.incremental:
+            print("--watch and --incremental only work with a single raid file.")
+            sys.exit(1)
+        batch(args, aliases, raid_files)
+        if args.errors_json:
+            errorlog.save(args.errors_json)
+        save_profile(args)
+        startup.mark("done")
+        if args.startup_report or args.startup_budget is not None:
+            if not startup.report(args.startup_budget):
+                sys.exit(1)
+        return
+    load_inputs(args, aliases)
+
+    # Build the jinja2 environment
+    environment = build_environment(args)
+
+    # Read and render each template (except the header)
+    template_files = find_templates(args.templates)
+    if not template_files:
+        colorama = startup.timed_import("colorama")
+        print(
+            f"{colorama.Fore.RED}*** ERROR: No template files found in {args.templates} ***{colorama.Style.RESET_ALL}"
+        )
+        sys.exit(1)
+
+    # Work out which templates can reuse their note from last time.
+    reused = {}
+    dependencies = {}
+    if args.incremental:
+        state = deps.load_state(args.deps_file, args.output, args.minify)
+        try:
+            with open(args.output, "r") as f:
+                previous = json.load(f)
+        except (OSError, ValueError):
+            previous = {}
+        for template_file in template_files:
+            entry = state["templates"].get(str(template_file))
+            if entry and template_file.stem in previous and deps.is_current(entry, raid, assignments):
+                reused[template_file] = previous[template_file.stem]
+                dependencies[str(template_file)] = entry
+
+    startup.mark("ready to render")
+    report_missing_players(environment, template_files)
+    report_unfilled_slots()
+    rendered = render_templates(args, environment, [x for x in template_files if x not in reused])
+    notes = {}
+    total_bytes = 0
+    total_minified = 0
+    manifest = Manifest(args.manifest)
+    with NoteWriter(args.output, manifest.hashes(args.output)) as writer:
+        for template_file in template_files:
+            if template_file in reused:
+                x = reused[template_file]
+                seconds = None
+                for error in dependencies[str(template_file)]["errors"]:
+                    errorlog.add(errorlog.Error.from_json(error))
+            else:
+                _, result = next(rendered)
+                x, seconds = result.note, result.seconds
+                if result.dependencies is not None:
+                    dependencies[str(template_file)] = result.dependencies
+            full_size = len(x.encode())
+            x = output_note(args, x)
+            writer.write(template_file.stem, x)
+            size = len(x.encode())
+            total_bytes += size
+            total_minified += full_size - size
+            if args.summary:
+                timing = "  reused" if seconds is None else f"{seconds * 1000:6.1f} ms"
+                saved = f" {full_size - size:6d} minified" if args.minify else ""
+                print(f"{size:8d} bytes{saved} {timing}  {template_file}")
+            elif not args.quiet:
+                print("===========================================")
+                print(x)
+            # --watch needs every note to rewrite the output, otherwise they're not kept.
+            if args.watch:
+                notes[template_file] = x
+    if args.summary:
+        print(f"{total_bytes:8d} bytes in {len(template_files)} notes, written to {args.output}")
+    if args.minify:
+        before = total_bytes + total_minified
+        print(f"Minifying saved {total_minified} of {before} bytes ({total_minified / max(before, 1):.1%}).")
+    record_output(args, manifest, args.output, writer)
+    manifest.save()
+
+    if args.incremental:
+        deps.save_state(args.deps_file, args.output, dependencies, args.minify)
+        print(f"Rendered {len(template_files) - len(reused)} templates, reused {len(reused)}.")
 
     errorlog.show()
+    if args.errors_json:
+        errorlog.save(args.errors_json)
+    save_profile(args)
+    startup.mark("done")
+    if args.startup_report or args.startup_budget is not None:
+        if not startup.report(args.startup_budget):
+            sys.exit(1)
+
+    if args.watch:
+        errorlog.fetch().clear()
+        watch(args, aliases, environment, notes, dependencies)
 if __name__ == "__main__":
-    main()
+    main()
\ No newline at end of file
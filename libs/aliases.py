@@ -0,0 +1,49 @@
+"""Map Raid-Helper signup names to the character names used in templates."""
+
+import functools
+import pathlib
+from . import startup
+
+DEFAULT_PATH = pathlib.Path(__file__).resolve().parent.parent / "aliases.yaml"
+
+
+class AliasTable:
+    def __init__(self, aliases: dict[str, str] = None):
+        # casefolded signup name -> (name, alts), from the aliases file.
+        self._aliases = {}
+        # exact signup name -> (name, alts), for every name resolved so far.
+        self._resolved = {}
+        for signup, name in (aliases or {}).items():
+            self._aliases[str(signup).casefold()] = (str(name), ())
+
+    @classmethod
+    def load(cls, path: str | pathlib.Path) -> "AliasTable":
+        """Load an aliases YAML file. A missing file gives an empty table."""
+        try:
+            with open(path, "r") as f:
+                yaml = startup.timed_import("yaml")
+                return cls(yaml.safe_load(f))
+        except FileNotFoundError:
+            return cls()
+
+    def resolve(self, name: str) -> tuple[str, tuple[str, ...]]:
+        """Return (name, alts) for a signup name, e.g. "A/B/C" -> ("A", ("B", "C"))."""
+        try:
+            return self._resolved[name]
+        except KeyError:
+            pass
+        result = self._aliases.get(name.casefold())
+        if result is None:
+            parts = [part.strip() for part in name.split("/") if part.strip()]
+            if len(parts) > 1:
+                result = (self.resolve(parts[0])[0], tuple(self.resolve(part)[0] for part in parts[1:]))
+            else:
+                result = (name, ())
+        self._resolved[name] = result
+        return result
+
+
+@functools.cache
+def default() -> AliasTable:
+    """The table from aliases.yaml next to generate.py, loaded once and shared."""
+    return AliasTable.load(DEFAULT_PATH)
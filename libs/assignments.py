@@ -0,0 +1,249 @@
+"""Fill the slots in assignments.yaml with players from the raid.
+
+A slot is a job in an encounter section that names a player, or asks for a
+class, optionally limited to some specs, and a number of players:
+
+    example:
+      named_assignment:
+        name: "Pumpledin"
+      mind_control_priests:
+        class: PRIEST
+        spec: SHADOW, HOLY, DISCIPLINE
+        number: 2
+
+Slots in the all: section are part of every encounter, unless the encounter
+has a job of the same name. Within an encounter a player fills at most one
+slot. Named slots are pinned first, then the class slots are filled together
+by bipartite matching, so a player who could fill several slots goes where
+they let the most slots be filled.
+
+The file is checked and compiled once into an Index of typed slots and
+flattened paths, which is kept on disk keyed by the file's hash, so an
+unchanged file is never parsed again."""
+
+import dataclasses
+import hashlib
+import os
+import pathlib
+import pickle
+import tempfile
+from .players import GameClass, Player, Spec
+from . import startup
+
+ALL = "all"
+SLOT_KEYS = {"name", "class", "spec", "number"}
+# Bump when Index or Slot change, so old compiled files are ignored.
+INDEX_VERSION = 1
+# How many compiled files to keep in the cache directory.
+CACHE_ENTRIES = 8
+
+
+@dataclasses.dataclass
+class Slot:
+    encounter: str
+    job: str
+    name: str = None
+    gameclass: GameClass = None
+    specs: tuple[Spec, ...] = ()
+    number: int = 1
+
+    @property
+    def path(self) -> str:
+        return f"{self.encounter}/{self.job}"
+
+    def accepts(self, player: Player) -> bool:
+        return player.gameclass == self.gameclass and (not self.specs or player.spec in self.specs)
+
+    def describe(self) -> str:
+        if self.name:
+            return self.name
+        specs = "/".join(x.value for x in self.specs)
+        return f"{self.number} {specs + ' ' if specs else ''}{self.gameclass.value}"
+
+
+@dataclasses.dataclass
+class Index:
+    # Encounter -> its slots, with the all: section merged in.
+    encounters: dict[str, list[Slot]] = dataclasses.field(default_factory=dict)
+    # (encounter, job) -> the slot.
+    slots: dict[tuple[str, str], Slot] = dataclasses.field(default_factory=dict)
+    # "encounter/key/..." -> the value at that path, with the all: section merged into each encounter.
+    values: dict[str, any] = dataclasses.field(default_factory=dict)
+    # Slots that couldn't be read, as messages for the error log.
+    problems: list[str] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass
+class Solution:
+    # (encounter, job) -> the players filling that slot, in raid order.
+    filled: dict[tuple[str, str], list[Player]] = dataclasses.field(default_factory=dict)
+    # Slots that couldn't be filled, or not completely.
+    unfilled: list[Slot] = dataclasses.field(default_factory=list)
+    # Slots that couldn't be read, as messages for the error log.
+    problems: list[str] = dataclasses.field(default_factory=list)
+
+    def messages(self) -> list[str]:
+        messages = list(self.problems)
+        for slot in self.unfilled:
+            found = len(self.filled.get((slot.encounter, slot.job), []))
+            messages.append(
+                f"Assignment {slot.path} needs {slot.describe()}, but only {found} could be assigned from the raid."
+            )
+        return messages
+
+
+def is_slot(value) -> bool:
+    return isinstance(value, dict) and bool(value) and value.keys() <= SLOT_KEYS and ("name" in value or "class" in value)
+
+
+def _specs(value) -> tuple[Spec, ...]:
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        value = value.split(",")
+    return tuple(Spec(str(x).strip().upper()) for x in value)
+
+
+def parse_slots(encounter: str, section: dict, problems: list[str]) -> dict[str, Slot]:
+    """The slots in one section of assignments.yaml, by job."""
+    slots = {}
+    for job, value in section.items():
+        if not is_slot(value):
+            continue
+        try:
+            slots[job] = Slot(
+                encounter=encounter,
+                job=job,
+                name=value.get("name"),
+                gameclass=GameClass(str(value["class"]).upper()) if "class" in value else None,
+                specs=_specs(value.get("spec")),
+                number=int(value.get("number", 1)),
+            )
+        except ValueError as e:
+            problems.append(f"Assignment {encounter}/{job} could not be read: {e}")
+    return slots
+
+
+def _flatten(prefix: str, value, values: dict[str, any]) -> None:
+    values[prefix] = value
+    if isinstance(value, dict):
+        for key, x in value.items():
+            _flatten(f"{prefix}/{key}", x, values)
+
+
+def compile_index(assignments: dict) -> Index:
+    """Check every slot once, and index the slots and values of every encounter by path."""
+    index = Index()
+    # Empty sections are encounters with only the all: jobs.
+    sections = {k: v or {} for k, v in (assignments or {}).items() if v is None or isinstance(v, dict)}
+    shared = parse_slots(ALL, sections.get(ALL, {}), index.problems)
+    shared_values = {}
+    for key, value in sections.get(ALL, {}).items():
+        _flatten(str(key), value, shared_values)
+    for encounter, section in sections.items():
+        own = shared if encounter == ALL else parse_slots(encounter, section, index.problems)
+        merged = {job: dataclasses.replace(slot, encounter=encounter) for job, slot in shared.items()}
+        merged.update(own)
+        index.encounters[encounter] = list(merged.values())
+        for job, slot in merged.items():
+            index.slots[encounter, job] = slot
+        for path, value in shared_values.items():
+            index.values[f"{encounter}/{path}"] = value
+        _flatten(str(encounter), section, index.values)
+    return index
+
+
+def load(path: str | pathlib.Path, cache_dir: str | pathlib.Path = None) -> tuple[dict, Index]:
+    """The assignments in a YAML file and their Index, from the compiled copy in cache_dir if there is one."""
+    source = pathlib.Path(path).read_bytes()
+    cached = None
+    if cache_dir is not None:
+        key = hashlib.sha256(b"%d\0%s" % (INDEX_VERSION, source)).hexdigest()
+        cached = pathlib.Path(cache_dir) / f"{key}.pickle"
+        try:
+            with open(cached, "rb") as f:
+                assignments, index = pickle.load(f)
+            os.utime(cached)
+            return assignments, index
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError):
+            pass
+
+    yaml = startup.timed_import("yaml")
+    assignments = yaml.safe_load(source)
+    index = compile_index(assignments)
+    if cached is not None:
+        _store(cached, (assignments, index))
+    return assignments, index
+
+
+def _store(path: pathlib.Path, value) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError:
+        pathlib.Path(tmp).unlink(missing_ok=True)
+        return
+    entries = sorted(path.parent.glob("*.pickle"), key=lambda x: x.stat().st_mtime, reverse=True)
+    for entry in entries[CACHE_ENTRIES:]:
+        entry.unlink(missing_ok=True)
+
+
+def _augment(unit: int, edges: list[list[int]], owner: dict[int, int], seen: set[int]) -> bool:
+    """Kuhn's augmenting path search: find unit a player, moving other units to other players if needed."""
+    for player in edges[unit]:
+        if player in seen:
+            continue
+        seen.add(player)
+        if player not in owner or _augment(owner[player], edges, owner, seen):
+            owner[player] = unit
+            return True
+    return False
+
+
+def solve_encounter(slots: list[Slot], raid, solution: Solution) -> None:
+    pinned = set()
+    for slot in slots:
+        if not slot.name:
+            continue
+        player = raid.getplayer_by_name(slot.name, errors=False)
+        if player is None or id(player) in pinned:
+            solution.filled[slot.encounter, slot.job] = []
+            solution.unfilled.append(slot)
+            continue
+        pinned.add(id(player))
+        solution.filled[slot.encounter, slot.job] = [player]
+
+    players = [x for x in raid.players if id(x) not in pinned]
+    # One unit per player a class slot needs, each with the indexes of the players who can fill it.
+    units = [slot for slot in slots if not slot.name for _ in range(slot.number)]
+    candidates = {}
+    edges = []
+    for slot in units:
+        if slot.job not in candidates:
+            candidates[slot.job] = [i for i, x in enumerate(players) if slot.accepts(x)]
+        edges.append(candidates[slot.job])
+
+    owner = {}
+    for unit in range(len(units)):
+        _augment(unit, edges, owner, set())
+
+    for slot in slots:
+        if not slot.name:
+            solution.filled[slot.encounter, slot.job] = []
+    for player in sorted(owner):
+        slot = units[owner[player]]
+        solution.filled[slot.encounter, slot.job].append(players[player])
+    for slot in slots:
+        if not slot.name and len(solution.filled[slot.encounter, slot.job]) < slot.number:
+            solution.unfilled.append(slot)
+
+
+def solve(index: Index, raid) -> Solution:
+    """Fill every slot of every encounter in the assignments from raid."""
+    solution = Solution(problems=list(index.problems))
+    for slots in index.encounters.values():
+        solve_encounter(slots, raid, solution)
+    return solution
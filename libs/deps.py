@@ -0,0 +1,215 @@
+"""Record what each template depended on when it was rendered, so --incremental
+runs can reuse the previous note of every template whose inputs haven't changed.
+
+A template depends on the files it loaded, the parts of the assignments it
+read, and the result of every roster query it made. Queries are replayed
+against the new raid to see whether their results changed. Templates that
+used random(), randomList() or anything else we can't replay are volatile,
+and are always rendered again."""
+
+import contextlib
+import hashlib
+import json
+import pathlib
+from . import errorlog
+
+STATE_VERSION = 1
+
+# The Recorder for the template being rendered, if any.
+current = None
+
+
+class Recorder:
+    def __init__(self):
+        self.files = {}
+        self.assignments = {}
+        self.roster = {}
+        self.volatile = False
+
+    def to_json(self, errors: list[errorlog.Error]) -> dict:
+        return {
+            "files": self.files,
+            "assignments": [[list(path), value] for path, value in self.assignments.items()],
+            "roster": [[*json.loads(query), value] for query, value in self.roster.items()],
+            "volatile": self.volatile,
+            "errors": [x.to_json() for x in errors],
+        }
+
+
+@contextlib.contextmanager
+def recording():
+    """Record the dependencies of everything rendered inside the block."""
+    global current
+    previous, current = current, Recorder()
+    try:
+        yield current
+    finally:
+        current = previous
+
+
+def digest(value) -> str:
+    """A short hash of a value made of players, lists, dicts and plain data."""
+    return hashlib.sha1(json.dumps(value, sort_keys=True, default=_describe).encode()).hexdigest()[:16]
+
+
+def _describe(value):
+    if hasattr(value, "gameclass"):
+        return [value.name, value.spec, value.gameclass]
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+def file_digest(path: str) -> str | None:
+    try:
+        return hashlib.sha1(pathlib.Path(path).read_bytes()).hexdigest()[:16]
+    except OSError:
+        return None
+
+
+def record_file(path: str) -> None:
+    if current is not None and path not in current.files:
+        current.files[path] = file_digest(path)
+
+
+def record_assignment(path: list[str], value) -> None:
+    if current is not None:
+        current.assignments[tuple(path)] = digest(value)
+
+
+def record_roster(method: str, args: tuple, kwargs: dict, result) -> None:
+    if current is None:
+        return
+    try:
+        query = json.dumps([method, args, kwargs], sort_keys=True)
+    except TypeError:
+        # Called with players or other objects we can't replay next run.
+        current.volatile = True
+        return
+    current.roster[query] = digest(result)
+
+
+def mark_volatile() -> None:
+    if current is not None:
+        current.volatile = True
+
+
+class RecordingRaid:
+    """Stands in for a Raid, recording every query made through it."""
+
+    def __init__(self, raid):
+        self._raid = raid
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        value = getattr(self._raid, name)
+        if not callable(value):
+            record_roster(name, None, None, value)
+            return value
+
+        def call(*args, **kwargs):
+            result = value(*args, **kwargs)
+            record_roster(name, args, kwargs, result)
+            return result
+
+        return call
+
+
+class RecordingAssignments(dict):
+    """Stands in for the assignments dict, recording which sections templates read."""
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        record_assignment([key], value)
+        return value
+
+    def get(self, key, default=None):
+        value = super().get(key, default)
+        record_assignment([key], value)
+        return value
+
+    def _record_all(self):
+        record_assignment([], dict(super().items()))
+
+    def __iter__(self):
+        self._record_all()
+        return super().__iter__()
+
+    def keys(self):
+        self._record_all()
+        return super().keys()
+
+    def values(self):
+        self._record_all()
+        return super().values()
+
+    def items(self):
+        self._record_all()
+        return super().items()
+
+
+def lookup_assignment(assignments: dict, path: list[str]):
+    value = assignments
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def code_version() -> str:
+    """A hash of generate.py and libs/, so changing the code forces a full rebuild."""
+    root = pathlib.Path(__file__).resolve().parent
+    sources = [root.parent / "generate.py", *sorted(root.glob("*.py"))]
+    return hashlib.sha1(b"".join(file_digest(p).encode() for p in sources if p.exists())).hexdigest()[:16]
+
+
+def load_state(path: str, output: str, minify: bool = False) -> dict:
+    """Load the dependency state of the last run that wrote output, or an empty state.
+    Notes are reused from output, so a run that minified them (or didn't) can't be reused
+    by one that doesn't."""
+    try:
+        with open(path, "r") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    if (
+        state.get("version") != STATE_VERSION
+        or state.get("code") != code_version()
+        or state.get("output") != str(output)
+        or state.get("minify", False) != minify
+    ):
+        state = {}
+    state.setdefault("templates", {})
+    return state
+
+
+def save_state(path: str, output: str, templates: dict, minify: bool = False) -> None:
+    state = {"version": STATE_VERSION, "code": code_version(), "output": str(output), "minify": minify, "templates": templates}
+    pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(state, f)
+
+
+def is_current(entry: dict, raid, assignments: dict, volatile_ok: bool = False) -> bool:
+    """Whether a template rendered with the dependencies in entry would render the same now.
+    Volatile templates never are, unless volatile_ok is set."""
+    if entry["volatile"] and not volatile_ok:
+        return False
+    for path, value in entry["files"].items():
+        if file_digest(path) != value:
+            return False
+    for path, value in entry["assignments"]:
+        if digest(lookup_assignment(assignments, path)) != value:
+            return False
+    with errorlog.muted():
+        for method, args, kwargs, value in entry["roster"]:
+            try:
+                attr = getattr(raid, method)
+                result = attr if args is None else attr(*args, **kwargs)
+            except Exception:
+                return False
+            if digest(result) != value:
+                return False
+    return True
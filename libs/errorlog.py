@@ -1,17 +1,176 @@
-import colorama
+"""Collect the errors found while loading and rendering, to show at the end.
+
+Each error has a code, and the template and line it came from when a
+template was being rendered, read from the jinja2 frame that called the
+helper adding it. Lines are lines of the template file, see source_lines.
+Adding an error that is already in the log only counts it again, so a bad
+name used in a loop is one entry however often it is hit. Messages can be
+given as a format string and its arguments, which are only formatted when
+the error is shown."""
+
+import contextlib
+import dataclasses
+import json
+import pathlib
+import sys
+from . import startup
+
+# Error codes.
+ERROR = "error"
+MISSING_PLAYER = "missing-player"
+NO_MATCH = "no-match"
+BAD_PREDICATE = "bad-predicate"
+ASSIGNMENT = "assignment"
+NO_HISTORY = "no-history"
+INPUT = "input"
+
+
+@dataclasses.dataclass(eq=False)
+class Error:
+    code: str
+    # The message, or a str.format string for args.
+    text: str
+    args: tuple = ()
+    template: str = None
+    line: int = None
+    # The raid it was found in, when rendering several.
+    raid: str = None
+    count: int = 1
+
+    @property
+    def message(self) -> str:
+        return self.text.format(*self.args) if self.args else self.text
+
+    def key(self) -> tuple:
+        key = (self.code, self.text, self.args, self.template, self.line, self.raid)
+        try:
+            hash(key)
+        except TypeError:
+            # Lists and dicts in args, compare them by how they are shown instead.
+            key = (self.code, self.message, (), self.template, self.line, self.raid)
+        return key
+
+    def __str__(self):
+        location = f"{self.template}:{self.line}" if self.template and self.line else self.template
+        where = ": ".join(x for x in (self.raid, location) if x)
+        count = f" (x{self.count})" if self.count > 1 else ""
+        return f"{where}: {self.message}{count}" if where else f"{self.message}{count}"
+
+    def to_json(self) -> dict:
+        fields = {"code": self.code, "message": self.message, "template": self.template, "line": self.line, "raid": self.raid, "count": self.count}
+        return {k: v for k, v in fields.items() if v is not None}
+
+    @classmethod
+    def from_json(cls, value: dict | str) -> "Error":
+        if isinstance(value, str):
+            return cls(ERROR, value)
+        return cls(value.get("code", ERROR), value["message"], (), value.get("template"), value.get("line"), value.get("raid"), value.get("count", 1))
+
+
+class Log:
+    """Errors in the order they were first added, each once with a count."""
+
+    def __init__(self):
+        self.errors = []
+        self._index = {}
+
+    def add(self, error: Error) -> None:
+        key = error.key()
+        found = self._index.get(key)
+        if found is not None:
+            found.count += error.count
+            return
+        self._index[key] = error
+        self.errors.append(error)
+
+    def __len__(self):
+        return len(self.errors)
+
+    def __iter__(self):
+        return iter(self.errors)
+
+    def __getitem__(self, index):
+        return self.errors[index]
+
+    def __delitem__(self, index):
+        del self.errors[index]
+        self._index = {x.key(): x for x in self.errors}
+
+    def clear(self) -> None:
+        self.errors.clear()
+        self._index.clear()
+
 
 # Make an error log
-elog = []
+elog = Log()
+
+# Template filename -> the line of the file each line of the template, as its loader
+# returned it, comes from. Set by loaders that change the lines of templates.
+source_lines = {}
+
+
+def _rendering() -> tuple[str | None, int | None]:
+    """The template and line being rendered, if the error came from a template."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        template = frame.f_globals.get("__jinja_template__")
+        if template is not None:
+            name = pathlib.PurePath(template.name).stem if template.name else None
+            line = template.get_corresponding_lineno(frame.f_lineno)
+            lines = source_lines.get(template.filename)
+            if lines is not None:
+                line = lines[line - 1] if 0 < line <= len(lines) else None
+            return name, line
+        frame = frame.f_back
+    return None, None
+
 
-def add(error: str) -> None:
-    elog.append(error)
+def add(error: str | Error, *args, code: str = ERROR, template: str = None, line: int = None) -> None:
+    """Add an error, formatting error with args only when it is shown."""
+    if not isinstance(error, Error):
+        if template is None:
+            template, line = _rendering()
+        error = Error(code, error, args, template, line)
+    elog.add(error)
 
 
-def fetch() -> list[str]:
+def fetch() -> Log:
     return elog
 
 
+@contextlib.contextmanager
+def scope(keep: bool = True):
+    """Collect the errors added inside the block in a Log of their own, which is
+    merged into the enclosing log afterwards unless keep is False."""
+    global elog
+    saved, elog = elog, Log()
+    try:
+        yield elog
+    finally:
+        inner, elog = elog, saved
+        if keep:
+            for error in inner:
+                elog.add(dataclasses.replace(error))
+
+
+@contextlib.contextmanager
+def muted():
+    """Discard any errors added inside the block."""
+    with scope(keep=False):
+        yield
+
+
+def to_json() -> dict:
+    return {"errors": [x.to_json() for x in elog], "total": sum(x.count for x in elog)}
+
+
+def save(path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(to_json(), f, indent=2)
+
+
 def show():
+    colorama = startup.timed_import("colorama")
     if not elog:
         print(f"{colorama.Fore.GREEN}*** No errors found ***{colorama.Style.RESET_ALL}")
     else:
@@ -21,4 +180,3 @@ def show():
         for error in elog:
             print(error)
         print(f"{colorama.Style.RESET_ALL}")
-        
\ No newline at end of file
@@ -0,0 +1,250 @@
+"""A local SQLite database of past raids, built from Raid-Helper exports.
+
+generate.py --ingest <DIR|GLOB|FILE> adds exports to the database, skipping
+files that haven't changed since they were last ingested. Players are keyed
+by their Raid-Helper userid, so someone who changes their name is still the
+same player. Templates query it through History, e.g. attendance("Nicc") or
+played("PRIEST", "HOLY", last=4)."""
+
+import dataclasses
+import hashlib
+import pathlib
+import sqlite3
+import typing
+from .aliases import AliasTable
+from .players import Player
+from .raidhelper import read_exports
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS raids (
+    id INTEGER PRIMARY KEY,
+    export_id TEXT NOT NULL UNIQUE,
+    title TEXT,
+    started INTEGER NOT NULL,
+    source TEXT NOT NULL REFERENCES sources(path) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS raids_started ON raids(started);
+CREATE TABLE IF NOT EXISTS players (
+    userid TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    last_seen INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS players_name ON players(name COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS signups (
+    raid_id INTEGER NOT NULL REFERENCES raids(id) ON DELETE CASCADE,
+    userid TEXT NOT NULL,
+    name TEXT NOT NULL,
+    class TEXT,
+    spec TEXT,
+    gameclass TEXT,
+    game_spec TEXT,
+    party INTEGER,
+    slot INTEGER,
+    signup_time INTEGER,
+    PRIMARY KEY (raid_id, userid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS signups_userid ON signups(userid, raid_id);
+CREATE INDEX IF NOT EXISTS signups_name ON signups(name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS signups_spec ON signups(gameclass, game_spec, raid_id);
+"""
+
+
+class Attendance(typing.NamedTuple):
+    attended: int
+    raids: int
+
+    @property
+    def ratio(self) -> float:
+        return self.attended / self.raids if self.raids else 0.0
+
+    def __str__(self):
+        return f"{self.attended}/{self.raids}"
+
+
+@dataclasses.dataclass
+class IngestResult:
+    files: int = 0
+    unchanged: int = 0
+    raids: int = 0
+    duplicates: int = 0
+    # (path, error) of files that aren't Raid-Helper exports.
+    failed: list[tuple[pathlib.Path, Exception]] = dataclasses.field(default_factory=list)
+
+
+def _started(fields: dict, entries: list[dict]) -> int:
+    """When a raid was, in seconds since the epoch. Raid-Helper ids start with the time they were
+    created; otherwise use the last signup."""
+    try:
+        return int(str(fields["_id"])[:8], 16)
+    except (KeyError, ValueError):
+        return max((int(x.get("signuptime") or 0) for x in entries), default=0)
+
+
+def _int(value) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class History:
+    """The history database at path, opened when first used."""
+
+    def __init__(self, path: str | pathlib.Path):
+        self.path = pathlib.Path(path)
+        self._db = None
+
+    def __getstate__(self):
+        # Connections can't be sent to --jobs workers, they open their own.
+        return {"path": self.path, "_db": None}
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path)
+            self._db.execute("PRAGMA foreign_keys = ON")
+            version = self._db.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                self._db.executescript(SCHEMA + f"PRAGMA user_version = {SCHEMA_VERSION};")
+        return self._db
+
+    def exists(self) -> bool:
+        return self._db is not None or self.path.exists()
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def ingest(self, paths: list[pathlib.Path], aliases: AliasTable = None) -> IngestResult:
+        """Add the raids in each export file, skipping files that were ingested before
+        and haven't changed. A file that changed replaces the raids it had before."""
+        result = IngestResult()
+        db = self.db
+        for path in paths:
+            result.files += 1
+            key = str(path.resolve())
+            stat = path.stat()
+            known = db.execute("SELECT size, mtime_ns, digest FROM sources WHERE path = ?", (key,)).fetchone()
+            if known and known[:2] == (stat.st_size, stat.st_mtime_ns):
+                result.unchanged += 1
+                continue
+            with open(path, "rb") as f:
+                digest = hashlib.file_digest(f, "sha1").hexdigest()
+            if known and known[2] == digest:
+                db.execute("UPDATE sources SET size = ?, mtime_ns = ? WHERE path = ?", (stat.st_size, stat.st_mtime_ns, key))
+                result.unchanged += 1
+                continue
+
+            try:
+                with db, open(path, "rb") as f:
+                    db.execute("DELETE FROM sources WHERE path = ?", (key,))
+                    db.execute("INSERT INTO sources VALUES (?, ?, ?, ?)", (key, stat.st_size, stat.st_mtime_ns, digest))
+                    for fields, entries in read_exports(f, keep=("_id", "title")):
+                        added = self._add_raid(key, fields, list(entries), aliases)
+                        result.raids += added
+                        result.duplicates += not added
+            except (ValueError, KeyError, TypeError) as e:
+                result.failed.append((path, e))
+        db.commit()
+        return result
+
+    def _add_raid(self, source: str, fields: dict, entries: list[dict], aliases: AliasTable) -> bool:
+        db = self.db
+        started = _started(fields, entries)
+        export_id = str(fields.get("_id") or hashlib.sha1(f"{source}\0{started}".encode()).hexdigest())
+        cursor = db.execute(
+            "INSERT OR IGNORE INTO raids (export_id, title, started, source) VALUES (?, ?, ?, ?)",
+            (export_id, fields.get("title"), started, source),
+        )
+        if not cursor.rowcount:
+            return False
+        raid_id = cursor.lastrowid
+        signups = []
+        for entry in entries:
+            if not entry["name"] or not entry.get("userid"):
+                continue
+            player = Player(name=entry["name"], rh_string=entry["spec"], aliases=aliases)
+            signups.append(
+                (
+                    raid_id,
+                    str(entry["userid"]),
+                    player.name,
+                    entry.get("class"),
+                    entry.get("spec"),
+                    player.gameclass and player.gameclass.value,
+                    player.spec and player.spec.value,
+                    _int(entry.get("partyId")),
+                    _int(entry.get("slotId")),
+                    _int(entry.get("signuptime")),
+                )
+            )
+        db.executemany("INSERT OR IGNORE INTO signups VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", signups)
+        db.executemany(
+            """INSERT INTO players (userid, name, last_seen) VALUES (?, ?, ?)
+            ON CONFLICT(userid) DO UPDATE SET name = excluded.name, last_seen = excluded.last_seen
+            WHERE excluded.last_seen >= players.last_seen""",
+            [(x[1], x[2], started) for x in signups],
+        )
+        return True
+
+    def _userids(self, name: str) -> list[str]:
+        """Everyone who is called name now, or signed up as name before."""
+        rows = self.db.execute(
+            """SELECT userid FROM players WHERE name = ?1 COLLATE NOCASE
+            UNION SELECT userid FROM signups WHERE name = ?1 COLLATE NOCASE""",
+            (name,),
+        )
+        return [x[0] for x in rows]
+
+    def raid_count(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM raids").fetchone()[0]
+
+    def attendance(self, name: str, last: int = None) -> Attendance:
+        """How many of the last raids (or all of them) someone called name was in."""
+        userids = self._userids(str(name))
+        limit = -1 if last is None else last
+        marks = ",".join("?" * len(userids))
+        attended, raids = self.db.execute(
+            f"""SELECT COUNT(DISTINCT s.raid_id), (SELECT COUNT(*) FROM (SELECT id FROM raids ORDER BY started DESC LIMIT ?1))
+            FROM (SELECT id FROM raids ORDER BY started DESC LIMIT ?1) AS r
+            JOIN signups AS s ON s.raid_id = r.id AND s.userid IN ({marks or "NULL"})""",
+            (limit, *userids),
+        ).fetchone()
+        return Attendance(attended, raids)
+
+    def played(self, gameclass: str, spec: str = None, last: int = None) -> list[str]:
+        """The current names of everyone who played a class (and spec) in the last raids,
+        most recent first."""
+        limit = -1 if last is None else last
+        query = """SELECT p.name FROM (SELECT id, started FROM raids ORDER BY started DESC LIMIT ?) AS r
+            JOIN signups AS s ON s.raid_id = r.id
+            JOIN players AS p ON p.userid = s.userid
+            WHERE s.gameclass = ?"""
+        params = [limit, str(gameclass).upper()]
+        if spec:
+            query += " AND s.game_spec = ?"
+            params.append(str(spec).upper())
+        query += " GROUP BY s.userid ORDER BY MAX(r.started) DESC, p.name"
+        # Two players can have the same name after aliasing.
+        return list(dict.fromkeys(x[0] for x in self.db.execute(query, params)))
+
+    def renames(self, name: str) -> list[str]:
+        """Every name someone called name has signed up with, oldest first."""
+        userids = self._userids(str(name))
+        marks = ",".join("?" * len(userids)) or "NULL"
+        rows = self.db.execute(
+            f"""SELECT s.name FROM signups AS s JOIN raids AS r ON r.id = s.raid_id
+            WHERE s.userid IN ({marks}) GROUP BY s.name ORDER BY MIN(r.started)""",
+            userids,
+        )
+        return [x[0] for x in rows]
@@ -0,0 +1,82 @@
+"""Content hashes of the notes in each output file, to tell which notes changed since the last run.
+
+The manifest maps each output file to the sha1 of every note in it. With
+generate.py --delta, the notes that were added or changed since the last run
+are written to a delta file next to the output, in the same format, so only
+they need importing. Removed notes are in it as empty notes."""
+
+import hashlib
+import json
+import pathlib
+import typing
+
+MANIFEST_VERSION = 1
+
+
+def note_hash(note: str) -> str:
+    return hashlib.sha1(note.encode()).hexdigest()
+
+
+class Delta(typing.NamedTuple):
+    added: list[str]
+    changed: list[str]
+    removed: list[str]
+    unchanged: int
+
+    def __str__(self):
+        return f"{len(self.changed)} changed, {len(self.added)} added, {len(self.removed)} removed, {self.unchanged} unchanged"
+
+
+def diff(old: dict[str, str], new: dict[str, str]) -> Delta:
+    """What changed between two {name: hash} dicts, in the order of new (removed notes in the order of old)."""
+    added = [name for name in new if name not in old]
+    changed = [name for name in new if name in old and old[name] != new[name]]
+    removed = [name for name in old if name not in new]
+    return Delta(added, changed, removed, len(new) - len(added) - len(changed))
+
+
+def delta_path(output: str | pathlib.Path) -> pathlib.Path:
+    output = pathlib.Path(output)
+    return output.with_name(f"{output.stem}.delta.json")
+
+
+def write_delta(path: str | pathlib.Path, notes: dict[str, str], delta: Delta) -> None:
+    """Write the added and changed notes, and the removed ones as empty notes."""
+    changes = {name: notes[name] for name in [*delta.changed, *delta.added]}
+    changes.update((name, "") for name in delta.removed)
+    with open(path, "w") as f:
+        json.dump(changes, f, separators=(",", ": "))
+
+
+class Manifest:
+    """The manifest at path, as it was when loaded. save() writes it back with any outputs that
+    were updated, leaving out outputs that no longer exist."""
+
+    def __init__(self, path: str | pathlib.Path):
+        self.path = pathlib.Path(path)
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        self.outputs = data.get("outputs", {}) if data.get("version") == MANIFEST_VERSION else {}
+
+    def hashes(self, output: str | pathlib.Path) -> dict[str, str]:
+        """{name: hash} of the notes last written to output, from the manifest, or else
+        from output itself. Empty if neither has them."""
+        if str(output) in self.outputs:
+            return self.outputs[str(output)]
+        try:
+            with open(output) as f:
+                return {name: note_hash(note) for name, note in json.load(f).items()}
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def update(self, output: str | pathlib.Path, hashes: dict[str, str]) -> None:
+        self.outputs[str(output)] = hashes
+
+    def save(self) -> None:
+        self.outputs = {output: hashes for output, hashes in self.outputs.items() if pathlib.Path(output).exists()}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump({"version": MANIFEST_VERSION, "outputs": self.outputs}, f)
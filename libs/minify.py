@@ -0,0 +1,112 @@
+"""Make rendered notes smaller without changing what MRT displays, for generate.py --minify.
+
+- Colour codes are re-emitted only where the colour of visible text changes,
+  so adjacent runs of the same colour are merged, colour wraps around nothing
+  or only whitespace are dropped, and so are |r codes that close nothing.
+- Adjacent {p:...} blocks for the same players are merged, and blocks with
+  nothing in them are dropped.
+- Whitespace at the end of lines, and blank lines at the end of the note,
+  are removed.
+
+Colour codes are left as they are from the first colour opened inside another
+one onwards, since WoW versions disagree on what |r goes back to after that,
+and within {p:...} blocks that start with a colour open, since what happens
+to a colour opened in a block that is hidden from some players is up to MRT."""
+
+import re
+
+# ||, which displays a |, a colour code, a reset code, or a {p:...} or {/p} tag.
+_TOKENS = re.compile(r"(\|\|)|\|c([0-9a-fA-F]{8})|(\|r)|(\{p:[^}]*\}|\{/p\})")
+_TRAILING_SPACE = re.compile(r"[ \t]+(?=\n|$)")
+_EMPTY_BLOCK = re.compile(r"\{p:[^}]*\}\{/p\}")
+_REPEATED_BLOCK = re.compile(r"\{/p\}(\{p:[^}]*\})")
+
+
+def _recolor(runs: list[tuple[str | None, str]], start: str | None, end: str | None, last: bool = False) -> str:
+    """Text of (colour, text) runs with as few colour codes as possible, when the colour
+    is start before them and should be end after them, unless they are the last in the note."""
+    out = []
+    current = start
+    # Whitespace looks the same in any colour, so it goes after the |r of a colour that ends.
+    spaces = []
+
+    def switch(color):
+        if current is not None:
+            out.append("|r")
+        out.extend(spaces)
+        spaces.clear()
+        if color is not None:
+            out.append(f"|c{color}")
+        return color
+
+    for color, text in runs:
+        if not text:
+            continue
+        if text.isspace():
+            spaces.append(text)
+            continue
+        if color != current:
+            current = switch(color)
+        out.extend(spaces)
+        spaces.clear()
+        out.append(text)
+    if current != end and not last:
+        current = switch(end)
+    out.extend(spaces)
+    return "".join(out)
+
+
+def _minify_colors(note: str) -> str:
+    out = []
+    # Each {p:...} or {/p} tag starts a segment. Segments that start with no colour open
+    # are re-emitted from their (colour, text) runs, the others are copied as they are.
+    color = None
+    segment_start = None
+    runs = []
+    raw = []
+
+    def flush(last: bool = False):
+        out.append(_recolor(runs, segment_start, color, last) if segment_start is None else "".join(raw))
+
+    position = 0
+    for match in _TOKENS.finditer(note):
+        text = note[position : match.start()]
+        runs.append((color, text))
+        raw.append(text)
+        position = match.end()
+        pipe, hex_color, reset, tag = match.groups()
+        if hex_color and color is not None:
+            # Nested colours: leave the rest of the note alone.
+            flush()
+            out.append(note[match.start() :])
+            return "".join(out)
+        if tag:
+            flush()
+            out.append(tag)
+            segment_start = color
+            runs, raw = [], []
+            continue
+        raw.append(match.group())
+        if pipe:
+            runs.append((color, pipe))
+        elif hex_color:
+            color = hex_color.lower()
+        else:
+            color = None
+    runs.append((color, note[position:]))
+    raw.append(note[position:])
+    flush(last=True)
+    return "".join(out)
+
+
+def minify(note: str) -> str:
+    note = _minify_colors(note)
+    note = _REPEATED_BLOCK.sub(lambda m: "" if m.group(1) == _previous_tag(note, m.start()) else m.group(), note)
+    note = _EMPTY_BLOCK.sub("", note)
+    note = _TRAILING_SPACE.sub("", note)
+    return note.rstrip("\n")
+
+
+def _previous_tag(note: str, end: int) -> str | None:
+    start = note.rfind("{p:", 0, end)
+    return note[start : note.index("}", start) + 1] if start >= 0 else None
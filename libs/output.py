@@ -0,0 +1,77 @@
+"""Write notes to the MRTNoteImporter JSON file as they are rendered."""
+
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+
+
+class NoteWriter:
+    """Writes {"name": "note", ...} one note at a time, so notes needn't be kept in memory.
+
+    The notes go to a temporary file next to path, which only replaces path once
+    every note has been written, so a crash never leaves a half written output.
+    If path already holds exactly the same notes it is left alone, so its
+    modification time only changes when its notes do."""
+
+    def __init__(self, path: str | pathlib.Path, previous: dict[str, str] = None):
+        self.path = pathlib.Path(path)
+        self.previous = previous
+        fd, self.tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        self.file = os.fdopen(fd, "w")
+        self.file.write("{")
+        self.count = 0
+        self.size = 1
+        self.digest = hashlib.sha1(b"{")
+        # Name -> sha1 of each note written, see libs/manifest.py.
+        self.hashes = {}
+        # Name -> note, of the notes whose hash isn't the one in previous, if given.
+        self.moved = {}
+        # Whether close() replaced path, rather than finding it unchanged.
+        self.changed = None
+
+    def write(self, name: str, note: str) -> None:
+        # The same layout as json.dump(notes, f, separators=(',', ': ')).
+        text = f"{',' if self.count else ''}{json.dumps(name)}: {json.dumps(note)}"
+        self.file.write(text)
+        self.size += len(text)
+        self.digest.update(text.encode())
+        self.hashes[name] = hashlib.sha1(note.encode()).hexdigest()
+        if self.previous is not None and self.previous.get(name) != self.hashes[name]:
+            self.moved[name] = note
+        self.count += 1
+
+    def _unchanged(self) -> bool:
+        # json.dumps escapes everything outside ASCII, so len(text) is the size in bytes.
+        try:
+            if os.path.getsize(self.path) != self.size:
+                return False
+            with open(self.path, "rb") as f:
+                return hashlib.file_digest(f, "sha1").digest() == self.digest.digest()
+        except OSError:
+            return False
+
+    def close(self) -> None:
+        self.file.write("}")
+        self.file.close()
+        self.size += 1
+        self.digest.update(b"}")
+        self.changed = not self._unchanged()
+        if self.changed:
+            os.replace(self.tmp_path, self.path)
+        else:
+            pathlib.Path(self.tmp_path).unlink(missing_ok=True)
+
+    def abort(self) -> None:
+        self.file.close()
+        pathlib.Path(self.tmp_path).unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
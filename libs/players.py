@@ -1,9 +1,7 @@
 import dataclasses
-import aenum
 import enum
-from collections import namedtuple
-from typing import Tuple
-from xmlrpc.client import Boolean
+import sys
+from .aliases import AliasTable, default as default_aliases
 
 class GameClass(str, enum.Enum):
     WARRIOR = "WARRIOR"
@@ -20,9 +18,9 @@ class GameClass(str, enum.Enum):
     DEMONHUNTER = "DEMONHUNTER"
 
 
-class Spec(str, aenum.MultiValueEnum):
+class Spec(str, enum.Enum):
     # Warrior
-    PROTECTION = "PROTECTION", "PROTECTION1"
+    PROTECTION = "PROTECTION"
     ARMS = "ARMS"
     FURY = "FURY"
     # DK
@@ -59,34 +57,72 @@ class Spec(str, aenum.MultiValueEnum):
     SHADOW = "SHADOW"
     DISCIPLINE = "DISCIPLINE"
 
-@dataclasses.dataclass
+    @classmethod
+    def _missing_(cls, value):
+        # Raid-Helper calls paladin protection "Protection1".
+        if value == "PROTECTION1":
+            return cls.PROTECTION
+
+class_colors = {
+    GameClass.DEATHKNIGHT: "c41e3a",
+    GameClass.DRUID: "ff7c0a",
+    GameClass.HUNTER: "aad372",
+    GameClass.MAGE: "3fc7eb",
+    GameClass.PALADIN: "f48cba",
+    GameClass.PRIEST: "ffffff",
+    GameClass.ROGUE: "fff468",
+    GameClass.SHAMAN: "0070dd",
+    GameClass.WARLOCK: "8788ee",
+    GameClass.WARRIOR: "c69b6d"
+}
+
+@dataclasses.dataclass(slots=True)
 class Role:
     gameclass: GameClass
     spec: Spec
     rh_name: str
-    is_healer: Boolean = False
-    is_tank: Boolean = False
-    is_melee_dps: Boolean = False
-    is_caster_dps: Boolean = False
-    is_hunter_dps: Boolean = False
-    is_ranged_dps: Boolean = False
-    can_dispel_magic: Boolean = False
-    can_dispel_curse: Boolean = False
-    can_dispel_poison: Boolean = False
-    can_dispel_disease: Boolean = False
-    can_purge: Boolean = False
-    has_unholy_frenzy: Boolean = False
-    has_focus_magic: Boolean = False
-    has_misdirect: Boolean = False
-    has_power_infusion: Boolean = False
-    has_tricks: Boolean = False
-    has_innervate: Boolean = False
-    has_raidsac: Boolean = False
-    
+    is_healer: bool = False
+    is_tank: bool = False
+    is_melee_dps: bool = False
+    is_caster_dps: bool = False
+    is_hunter_dps: bool = False
+    is_ranged_dps: bool = False
+    can_dispel_magic: bool = False
+    can_dispel_curse: bool = False
+    can_dispel_poison: bool = False
+    can_dispel_disease: bool = False
+    can_purge: bool = False
+    has_unholy_frenzy: bool = False
+    has_focus_magic: bool = False
+    has_misdirect: bool = False
+    has_power_infusion: bool = False
+    has_tricks: bool = False
+    has_innervate: bool = False
+    has_raidsac: bool = False
+    # Flags, class and spec packed into one int, see FLAG_BITS.
+    mask: int = dataclasses.field(default=0, init=False, repr=False, compare=False)
+    # "|cffRRGGBB" for the class, shared by every player with this role.
+    color_prefix: str = dataclasses.field(default="", init=False, repr=False, compare=False)
+
     def __post_init__(self):
         if self.is_caster_dps or self.is_hunter_dps:
             self.is_ranged_dps = True
-    
+        self.color_prefix = f"|cff{class_colors[self.gameclass]}"
+        self.mask = FLAG_BITS[self.gameclass.value] | FLAG_BITS[self.spec.value]
+        for flag in ROLE_FLAGS:
+            if getattr(self, flag):
+                self.mask |= FLAG_BITS[flag]
+
+
+# The boolean is_/can_/has_ fields of Role, usable with Raid.getplayers_by_flag.
+ROLE_FLAGS = tuple(f.name for f in dataclasses.fields(Role) if f.name.startswith(("is_", "can_", "has_")))
+
+# One bit per role flag, class and spec name, for Role.mask and libs.predicate.
+FLAG_BITS = {
+    name: 1 << bit
+    for bit, name in enumerate([*ROLE_FLAGS, *(gc.value for gc in GameClass), *(sp.value for sp in Spec)])
+}
+
 
 roles = {
     # Warrior
@@ -258,6 +294,9 @@ roles = {
                                                     rh_name="Shadow")
 }
 
+# Raid-Helper spec string -> Role, e.g. "Holy1" -> the Holy Paladin role.
+roles_by_rh_name = {role.rh_name: role for role in roles.values()}
+
 
 # raidhelper_spec_to_class_spec = {
 #     # Warrior
@@ -306,65 +345,47 @@ roles = {
 #     "Destruction": (Spec.DESTRUCTION, GameClass.WARLOCK)
 # }
 
-class_colors = {
-    GameClass.DEATHKNIGHT: "c41e3a",
-    GameClass.DRUID: "ff7c0a",
-    GameClass.HUNTER: "aad372",
-    GameClass.MAGE: "3fc7eb",
-    GameClass.PALADIN: "f48cba",
-    GameClass.PRIEST: "ffffff",
-    GameClass.ROGUE: "fff468",
-    GameClass.SHAMAN: "0070dd",
-    GameClass.WARLOCK: "8788ee",
-    GameClass.WARRIOR: "c69b6d"
-}
 
 class Player:
-    def __init__(self, name: str, spec: Spec = None, gameclass: GameClass = None, rh_string: str = None):
-        self.name = name
-        match name:
-            case "Crowdcontrol/Safeword/Thornball":
-                self.name = "Crowdcontrol"
-            case "Scard/Jatia/Darge/UtesDad":
-                self.name = "Scard"
-            case "Backstab/Pink":
-                self.name = "Backstab"
-            case "meroe":
-                self.name = "Meroe"
-            case "halint":
-                self.name = "Halint"
-            case "rizz":
-                self.name = "Rizz"
-            case "AppleCandy":
-                self.name = "Applecandy"
-            case "DrPew":
-                self.name = "Drpew"
-            case "JeanClaudius":
-                self.name = "Jeanclaudius"
-            case "NorthFreeze":
-                self.name = "Northfreeze"
-            case "Foot":
-                self.name = "Footlover"
+    __slots__ = ("name", "alts", "spec", "gameclass", "role", "_color_name")
+
+    def __init__(
+        self,
+        name: str,
+        spec: Spec = None,
+        gameclass: GameClass = None,
+        rh_string: str = None,
+        aliases: AliasTable = None,
+    ):
+        name, alts = (aliases or default_aliases()).resolve(name)
+        self.name = sys.intern(name)
+        self.alts = alts
+        self.spec = None
+        self.gameclass = None
+        self.role = None
+        self._color_name = None
 
         # Construction with a name and a class
         if isinstance(gameclass, GameClass) and isinstance(spec, Spec):
             self.spec = spec
             self.gameclass = gameclass
+            self.role = roles.get((spec, gameclass))
 
         # Construction with a string for the spec (from raid-helper)
         elif rh_string:
-            for role in roles.values():
-                if role.rh_name == rh_string:
-                    self.spec = role.spec
-                    self.gameclass = role.gameclass
+            role = roles_by_rh_name.get(rh_string)
+            if role:
+                self.spec = role.spec
+                self.gameclass = role.gameclass
+                self.role = role
 
     def color_name(self):
-        # print(self.name)
-        return f"|cff{class_colors[self.gameclass]}{self.name}|r" 
-
-    @property
-    def role(self):
-        return roles[self.spec, self.gameclass]
+        if self._color_name is None:
+            if self.role:
+                self._color_name = f"{self.role.color_prefix}{self.name}|r"
+            else:
+                self._color_name = f"|cff{class_colors[self.gameclass]}{self.name}|r"
+        return self._color_name
 
     def __str__(self):
         return self.name
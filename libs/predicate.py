@@ -0,0 +1,108 @@
+"""Compile roster predicates such as "is_healer & can_dispel_magic & !PRIEST"
+into tests on Role.mask.
+
+Names are role flags (is_healer, has_tricks, ...), classes (PRIEST) or specs
+(HOLY), combined with & (and), | (or), ! (not) and parentheses. An expression
+is compiled once into a list of (required, forbidden) bit pairs, and a mask
+matches when it satisfies any one pair."""
+
+import functools
+import re
+from .players import FLAG_BITS
+
+_TOKEN = re.compile(r"\s*(?:([A-Za-z_][A-Za-z0-9_]*)|(\S))")
+
+
+def _tokenize(expression: str) -> list[str]:
+    tokens = []
+    pos = 0
+    while True:
+        match = _TOKEN.match(expression, pos)
+        if not match:
+            break
+        tokens.append(match.group(1) or match.group(2))
+        pos = match.end()
+    if expression[pos:].strip():
+        raise ValueError(f"Could not parse '{expression[pos:]}' in predicate '{expression}'")
+    return tokens
+
+
+def _and(left, right):
+    terms = []
+    for lreq, lforb in left:
+        for rreq, rforb in right:
+            req, forb = lreq | rreq, lforb | rforb
+            if not req & forb:
+                terms.append((req, forb))
+    return terms
+
+
+def _not(terms):
+    result = [(0, 0)]
+    for req, forb in terms:
+        negated = [(0, 1 << b) for b in range(req.bit_length()) if req >> b & 1]
+        negated += [(1 << b, 0) for b in range(forb.bit_length()) if forb >> b & 1]
+        result = _and(result, negated)
+    return result
+
+
+class _Parser:
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.tokens = _tokenize(expression)
+        self.pos = 0
+
+    def peek(self) -> str | None:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self) -> str:
+        token = self.peek()
+        if token is None:
+            raise ValueError(f"Unexpected end of predicate '{self.expression}'")
+        self.pos += 1
+        return token
+
+    def parse(self):
+        terms = self.parse_or()
+        if self.peek() is not None:
+            raise ValueError(f"Unexpected '{self.peek()}' in predicate '{self.expression}'")
+        return terms
+
+    def parse_or(self):
+        terms = self.parse_and()
+        while self.peek() == "|":
+            self.take()
+            terms = terms + self.parse_and()
+        return terms
+
+    def parse_and(self):
+        terms = self.parse_not()
+        while self.peek() == "&":
+            self.take()
+            terms = _and(terms, self.parse_not())
+        return terms
+
+    def parse_not(self):
+        token = self.take()
+        if token == "!":
+            return _not(self.parse_not())
+        if token == "(":
+            terms = self.parse_or()
+            if self.take() != ")":
+                raise ValueError(f"Missing ')' in predicate '{self.expression}'")
+            return terms
+        bit = FLAG_BITS.get(token) or FLAG_BITS.get(token.upper())
+        if bit is None:
+            raise ValueError(f"Unknown flag, class or spec '{token}' in predicate '{self.expression}'")
+        return [(bit, 0)]
+
+
+@functools.lru_cache(maxsize=None)
+def compile_predicate(expression: str):
+    """Return a function taking a Role.mask and returning whether it matches expression.
+    Raises ValueError if the expression can't be parsed."""
+    terms = _Parser(expression).parse()
+    if len(terms) == 1:
+        ((req, forb),) = terms
+        return lambda mask: mask & req == req and not mask & forb
+    return lambda mask: any(mask & req == req and not mask & forb for req, forb in terms)
@@ -0,0 +1,153 @@
+"""Count and time what rendering spends its time on, for generate.py --profile.
+
+Each template render and every helper call made from it (instruct, first,
+random, assign, colortext, raid.getplayers, ...) is timed as a frame on a
+stack, so a helper called from inside another helper is attributed to both.
+The report has, per template, how often it was rendered, how long that took
+and how many bytes it produced; per helper, calls and cumulative and self
+time; and every stack in the collapsed format flame graph tools read:
+
+    MC - 1;first;raid.getplayers 1234
+
+where the number is the self time of that stack in microseconds."""
+
+import functools
+import json
+import pathlib
+import time
+
+
+class ProfiledRaid:
+    """Stands in for a Raid, timing every method called on it as raid.<method>."""
+
+    def __init__(self, raid, profiler: "Profiler"):
+        self._raid = raid
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        value = getattr(self._raid, name)
+        if not callable(value):
+            return value
+        return self._profiler.wrap(f"raid.{name}", value)
+
+
+class Profiler:
+    def __init__(self):
+        # Names of the frames being timed, outermost first.
+        self.stack = []
+        # Stack -> [calls, seconds, seconds spent in frames called from it]
+        self.frames = {}
+        # Template -> [renders, seconds, output bytes]
+        self.templates = {}
+
+    def call(self, name: str, function, *args, **kwargs):
+        """function(*args, **kwargs), timed as a frame called name."""
+        self.stack.append(name)
+        key = tuple(self.stack)
+        started = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            took = time.perf_counter() - started
+            self.stack.pop()
+            entry = self.frames.get(key)
+            if entry is None:
+                entry = self.frames[key] = [0, 0.0, 0.0]
+            entry[0] += 1
+            entry[1] += took
+            if len(key) > 1:
+                parent = self.frames.get(key[:-1])
+                if parent is None:
+                    parent = self.frames[key[:-1]] = [0, 0.0, 0.0]
+                parent[2] += took
+
+    def wrap(self, name: str, function):
+        @functools.wraps(function)
+        def profiled(*args, **kwargs):
+            return self.call(name, function, *args, **kwargs)
+
+        profiled.profiler = self
+        return profiled
+
+    def instrument(self, globals: dict) -> None:
+        """Time every function in a jinja2 environment's globals, and the methods of its raid."""
+        for name, value in globals.items():
+            if name == "raid" and value is not None and not isinstance(value, ProfiledRaid):
+                globals[name] = ProfiledRaid(value, self)
+            elif callable(value) and not isinstance(value, type) and getattr(value, "profiler", None) is not self:
+                globals[name] = self.wrap(name, value)
+
+    def raid(self, raid) -> ProfiledRaid:
+        return raid if isinstance(raid, ProfiledRaid) else ProfiledRaid(raid, self)
+
+    def render(self, name: str, template, **context) -> str:
+        """template.render(**context), timed as the template called name."""
+        started = time.perf_counter()
+        note = self.call(name, template.render, **context)
+        entry = self.templates.get(name)
+        if entry is None:
+            entry = self.templates[name] = [0, 0.0, 0]
+        entry[0] += 1
+        entry[1] += time.perf_counter() - started
+        entry[2] += len(note.encode())
+        return note
+
+    def helpers(self) -> dict[str, list]:
+        """Helper -> [calls, seconds, self seconds], over every template. A helper called
+        from inside itself only counts the outermost call's time."""
+        helpers = {}
+        for key, (calls, seconds, children) in self.frames.items():
+            if len(key) < 2:
+                continue
+            entry = helpers.setdefault(key[-1], [0, 0.0, 0.0])
+            entry[0] += calls
+            if key[-1] not in key[1:-1]:
+                entry[1] += seconds
+            entry[2] += seconds - children
+        return helpers
+
+    def report(self) -> dict:
+        templates = sorted(self.templates.items(), key=lambda x: x[1][1], reverse=True)
+        helpers = sorted(self.helpers().items(), key=lambda x: x[1][1], reverse=True)
+        return {
+            "seconds": sum(x[1] for x in self.templates.values()),
+            "bytes": sum(x[2] for x in self.templates.values()),
+            "templates": {
+                name: {"renders": renders, "seconds": seconds, "bytes": size}
+                for name, (renders, seconds, size) in templates
+            },
+            "helpers": {
+                name: {"calls": calls, "seconds": seconds, "self_seconds": own}
+                for name, (calls, seconds, own) in helpers
+            },
+        }
+
+    def collapsed(self) -> list[str]:
+        """Every stack in collapsed format, with its self time in microseconds."""
+        lines = []
+        for key, (_, seconds, children) in sorted(self.frames.items()):
+            micros = round((seconds - children) * 1e6)
+            if micros > 0:
+                lines.append(f"{';'.join(x.replace(';', ':') for x in key)} {micros}")
+        return lines
+
+    def save(self, path: str | pathlib.Path) -> pathlib.Path:
+        """Write the report to path, and the collapsed stacks next to it with a .folded suffix.
+        Returns where the stacks went."""
+        path = pathlib.Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+        folded = path.with_suffix(".folded")
+        folded.write_text("".join(f"{x}\n" for x in self.collapsed()))
+        return folded
+
+    def show(self, top: int = 5) -> None:
+        report = self.report()
+        print(f"*** Profile: {len(self.templates)} templates, {report['seconds'] * 1000:.1f} ms, {report['bytes']} bytes ***")
+        for name, x in list(report["templates"].items())[:top]:
+            print(f"{x['seconds'] * 1000:8.1f} ms {x['bytes']:8d} bytes  {name}")
+        for name, x in list(report["helpers"].items())[:top]:
+            print(f"{x['seconds'] * 1000:8.1f} ms {x['calls']:8d} calls  {name} ({x['self_seconds'] * 1000:.1f} ms self)")
@@ -1,47 +1,117 @@
+import collections
 import dataclasses
-from .players import GameClass, Player, Spec
+from .players import GameClass, Player, Spec, ROLE_FLAGS, FLAG_BITS
+from .predicate import compile_predicate
 from . import errorlog
 
 @dataclasses.dataclass
 class Raid:
     players: list[Player] = dataclasses.field(default_factory=list)
+    # The _id of the Raid-Helper export it was read from, if it had one.
+    export_id: str = None
+    # Indexes over players, kept up to date by add_player so lookups never scan the roster.
+    # Role.mask of each player, in the same order as players.
+    _masks: list[int] = dataclasses.field(default_factory=list, init=False, repr=False)
+    _by_name: dict[str, Player] = dataclasses.field(default_factory=dict, init=False, repr=False)
+    _by_alt: dict[str, Player] = dataclasses.field(default_factory=dict, init=False, repr=False)
+    _by_class: dict[GameClass, list[Player]] = dataclasses.field(
+        default_factory=lambda: collections.defaultdict(list), init=False, repr=False
+    )
+    _by_classspec: dict[tuple[GameClass, Spec], list[Player]] = dataclasses.field(
+        default_factory=lambda: collections.defaultdict(list), init=False, repr=False
+    )
+    _by_flag: dict[tuple[str, bool], list[Player]] = dataclasses.field(
+        default_factory=lambda: collections.defaultdict(list), init=False, repr=False
+    )
+    class_counts: collections.Counter = dataclasses.field(default_factory=collections.Counter, init=False, repr=False)
+    spec_counts: collections.Counter = dataclasses.field(default_factory=collections.Counter, init=False, repr=False)
+
+    def __post_init__(self):
+        players, self.players = self.players, []
+        for player in players:
+            self.add_player(player)
 
     def add_player(self, Player):
         self.players.append(Player)
+        self._masks.append(0)
+        self._by_name.setdefault(Player.name.casefold(), Player)
+        for alt in Player.alts:
+            self._by_alt.setdefault(alt.casefold(), Player)
+
+        gc = Player.gameclass
+        sp = Player.spec
+        if gc is None:
+            return
+        self._by_class[gc].append(Player)
+        self._by_classspec[gc, sp].append(Player)
+        self.class_counts[gc] += 1
+        self.spec_counts[gc, sp] += 1
+        if Player.role is not None:
+            mask = self._masks[-1] = Player.role.mask
+            for flag in ROLE_FLAGS:
+                self._by_flag[flag, bool(mask & FLAG_BITS[flag])].append(Player)
+
+    @staticmethod
+    def _gameclass(gameclass: GameClass | str) -> GameClass:
+        if isinstance(gameclass, str) and not isinstance(gameclass, GameClass):
+            return GameClass(gameclass.upper())
+        return gameclass
+
+    @staticmethod
+    def _spec(spec: Spec | str) -> Spec:
+        if isinstance(spec, str) and not isinstance(spec, Spec):
+            return Spec(spec.upper())
+        return spec
 
     def getplayers(self, gameclass: GameClass, spec: Spec = None) -> list[Player]:
-        if isinstance(gameclass, GameClass):
-            gc = gameclass
-        if isinstance(gameclass, str):
-            gc = GameClass(gameclass.upper())
-        
+        gc = self._gameclass(gameclass)
         if spec:
-            if isinstance(spec, Spec):
-                sp = spec
-            if isinstance(spec, str):
-                sp = Spec(spec.upper())
-            return [x for x in self.players if x.gameclass == gc and x.spec == sp]
+            return list(self._by_classspec.get((gc, self._spec(spec)), ()))
         else:
-            return [x for x in self.players if x.gameclass == gc]
+            return list(self._by_class.get(gc, ()))
+
+    def count(self, gameclass: GameClass, spec: Spec = None) -> int:
+        gc = self._gameclass(gameclass)
+        if spec:
+            return self.spec_counts[gc, self._spec(spec)]
+        return self.class_counts[gc]
 
     def getplayers_by_classspec(self, gameclass: GameClass, spec: Spec = None) -> Player:
         try:
             return self.getplayers(gameclass=gameclass, spec=spec)
         except:
-            errorlog.add(f"No match found for gameclass: {gameclass}, spec: {spec}")
+            errorlog.add("No match found for gameclass: {}, spec: {}", gameclass, spec, code=errorlog.NO_MATCH)
 
     def getplayers_by_flag(self, flag: str, value: any) -> list[Player]:
-        ret = [x for x in self.players if x.role.__dict__[flag] == value]
+        ret = list(self._by_flag.get((flag, value), ()))
+        if ret == []:
+            errorlog.add("No matches found for a player with flag '{}'.", flag, code=errorlog.NO_MATCH)
+        return ret
+
+    def select(self, expression: str) -> list[Player]:
+        """Players matching a predicate such as "is_healer & can_dispel_magic & !PRIEST",
+        see libs.predicate for the syntax."""
+        try:
+            test = compile_predicate(expression)
+        except ValueError as e:
+            errorlog.add("raid.select(\"{}\") is not a valid predicate: {}", expression, str(e), code=errorlog.BAD_PREDICATE)
+            return []
+        ret = [player for player, mask in zip(self.players, self._masks) if test(mask)]
         if ret == []:
-            errorlog.add(f"No matches found for a player with flag '{self.flag}'.")
+            errorlog.add("No matches found for a player matching '{}'.", expression, code=errorlog.NO_MATCH)
         return ret
 
     def getplayer_by_name(self, name: str, errors: bool = True) -> Player:
-        for player in self.players:
-            if player.name.upper() == name.upper():
-                return player
+        key = name.casefold()
+        player = self._by_name.get(key) or self._by_alt.get(key)
+        if player:
+            return player
         if errors:
-            errorlog.add(f"No player with name '{name}' is in the raid. Either correct the raid assignments, or correct raid composition.")
+            errorlog.add(
+                "No player with name '{}' is in the raid. Either correct the raid assignments, or correct raid composition.",
+                name,
+                code=errorlog.MISSING_PLAYER,
+            )
 
 def load_raid(json_str: str) -> Raid:
     new_raid = Raid()
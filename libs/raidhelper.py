@@ -0,0 +1,171 @@
+"""Read Raid-Helper exports without loading the whole document.
+
+Only the raidDrop entries of an export are used, so they are decoded one at a
+time as the file is read, and everything else (party names, emotes, bench,
+...) is skipped over without being decoded. A file can hold a single export,
+a JSON array of exports, or several exports one after another, and memory use
+only depends on the size of the largest raidDrop entry."""
+
+import codecs
+import json
+import re
+from typing import Iterator
+from .aliases import AliasTable
+from .players import Player
+from .raid import Raid
+
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# A string, a bracket, or a run of anything else, for skipping values.
+_SKIP = re.compile(r'"(?:[^"\\]|\\.)*"|[\[\]{}]|[^"\[\]{}]+')
+
+
+class _Scanner:
+    def __init__(self, f, chunk_size: int = CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        # Files opened in binary mode are decoded as they are read, without splitting characters.
+        self.decode = codecs.getincrementaldecoder("utf-8")().decode
+
+    def _fill(self) -> bool:
+        """Read another chunk, dropping what has been scanned. Returns False at the end of the file."""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        self.eof = not chunk
+        if isinstance(chunk, bytes):
+            chunk = self.decode(chunk, final=self.eof)
+        self.buf = self.buf[self.pos :] + chunk
+        self.pos = 0
+        return not self.eof
+
+    def peek(self) -> str:
+        """The next character that isn't whitespace, or "" at the end of the file."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Expected {' or '.join(repr(x) for x in chars)} in Raid-Helper export, found {char!r}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode the next value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number may continue in the next chunk.
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def skip(self) -> None:
+        """Move past the next value without decoding it."""
+        self.peek()
+        depth = 0
+        while True:
+            match = _SKIP.match(self.buf, self.pos)
+            if match is None or (match.end() == len(self.buf) and not self.eof):
+                # The token might continue in the next chunk.
+                if self._fill():
+                    continue
+                if match is None:
+                    raise ValueError("Unterminated string in Raid-Helper export")
+            token = match.group()
+            if token in "[{":
+                depth += 1
+            elif token in "]}":
+                depth -= 1
+            elif depth == 0:
+                # A string, number, true, false or null, up to the next delimiter.
+                end = min((i for i in (token.find(","), token.find(":")) if i >= 0), default=len(token))
+                self.pos += end if token[0] != '"' else len(token)
+                return
+            self.pos = match.end()
+            if depth == 0:
+                return
+
+    def export(self, keep: tuple[str, ...] = (), fields: dict = None) -> Iterator[dict]:
+        """The raidDrop entries of the export object at the current position.
+        The values of the keys in keep are put in fields as they are read."""
+        self.expect("{")
+        found = False
+        if self.peek() == "}":
+            self.pos += 1
+        else:
+            while True:
+                key = self.value()
+                self.expect(":")
+                if key == "raidDrop":
+                    found = True
+                    self.expect("[")
+                    if self.peek() == "]":
+                        self.pos += 1
+                    else:
+                        while True:
+                            yield self.value()
+                            if self.expect(",]") == "]":
+                                break
+                elif key in keep:
+                    fields[key] = self.value()
+                else:
+                    self.skip()
+                if self.expect(",}") == "}":
+                    break
+        if not found:
+            raise KeyError("raidDrop")
+
+    def exports(self, keep: tuple[str, ...] = ()) -> Iterator[tuple[dict, Iterator[dict]]]:
+        """(fields, raidDrop entries) of each export in the file, in order, see read_exports."""
+        while self.peek():
+            if self.peek() == "[":
+                self.pos += 1
+                if self.peek() == "]":
+                    self.pos += 1
+                    continue
+                while True:
+                    fields = {}
+                    yield fields, self.export(keep, fields)
+                    if self.expect(",]") == "]":
+                        break
+            else:
+                fields = {}
+                yield fields, self.export(keep, fields)
+
+
+def read_exports(f, keep: tuple[str, ...] = (), chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[dict, Iterator[dict]]]:
+    """(fields, entries) for each export in a Raid-Helper export file, where entries
+    iterates over its raidDrop entries and fields holds the values of the keys in keep.
+    fields is filled in as the export is read, so it is only complete once entries is
+    exhausted, and entries must be exhausted before moving on to the next export."""
+    return _Scanner(f, chunk_size).exports(keep)
+
+
+def read_raids(f, aliases: AliasTable = None, chunk_size: int = CHUNK_SIZE) -> Iterator[Raid]:
+    """A Raid for each export in a Raid-Helper export file, read as they are needed.
+    Raises ValueError or KeyError if the file isn't a Raid-Helper export."""
+    for fields, entries in read_exports(f, keep=("_id",), chunk_size=chunk_size):
+        raid = Raid()
+        for entry in entries:
+            if entry["name"]:
+                raid.add_player(Player(name=entry["name"], rh_string=entry["spec"], aliases=aliases))
+        if fields.get("_id") is not None:
+            raid.export_id = str(fields["_id"])
+        yield raid
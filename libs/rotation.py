@@ -0,0 +1,165 @@
+"""Fair rotation of jobs between players across raids, for generate.py --fair.
+
+Every pick is written to a ledger in the history database, with a running
+count and the last raid of each (job, player). A job picks the candidate who
+had it least recently (--fair recent) or least often (--fair often), ties
+broken by name, from a heap per job, so a pick stays O(log n) however long
+the history is.
+
+Raids are identified by the _id of their Raid-Helper export, or by their
+roster if the export has none. Rendering the same raid again first removes
+its earlier picks, so re-running a raid doesn't count twice and picks
+the same players as before."""
+
+import hashlib
+import heapq
+import pathlib
+import sqlite3
+
+MODES = ("recent", "often")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rotation_raids (
+    raid TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL
+);
+-- One row per pick, so a job shared by several calls counts each of them.
+CREATE TABLE IF NOT EXISTS rotation_turns (
+    raid TEXT NOT NULL,
+    job TEXT NOT NULL,
+    name TEXT NOT NULL,
+    seq INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rotation_turns_raid ON rotation_turns(raid);
+CREATE INDEX IF NOT EXISTS rotation_turns_job ON rotation_turns(job, name, seq);
+CREATE TABLE IF NOT EXISTS rotation_stats (
+    job TEXT NOT NULL,
+    name TEXT NOT NULL,
+    picks INTEGER NOT NULL,
+    last_seq INTEGER NOT NULL,
+    PRIMARY KEY (job, name)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS rotation_turn AFTER INSERT ON rotation_turns BEGIN
+    INSERT INTO rotation_stats (job, name, picks, last_seq) VALUES (new.job, new.name, 1, new.seq)
+    ON CONFLICT (job, name) DO UPDATE SET picks = picks + 1, last_seq = MAX(last_seq, new.seq);
+END;
+CREATE TRIGGER IF NOT EXISTS rotation_unturn AFTER DELETE ON rotation_turns BEGIN
+    UPDATE rotation_stats SET
+        picks = picks - 1,
+        last_seq = COALESCE((SELECT MAX(seq) FROM rotation_turns WHERE job = old.job AND name = old.name), 0)
+    WHERE job = old.job AND name = old.name;
+END;
+"""
+
+# Databases from before rotation_turns kept one pick per (raid, job) in rotation_picks.
+# Their picks are moved over, and the stats counted again from them.
+MIGRATE_PICKS = """
+DELETE FROM rotation_stats;
+INSERT INTO rotation_turns (raid, job, name, seq) SELECT raid, job, name, seq FROM rotation_picks;
+DROP TABLE rotation_picks;
+"""
+
+
+def raid_key(export_id: str | None, names: list[str]) -> str:
+    """Identifies a raid by its export's _id, or else by who is in it."""
+    if export_id:
+        return f"id:{export_id}"
+    return hashlib.sha1("\0".join(sorted(names)).encode()).hexdigest()[:16]
+
+
+class Rotation:
+    def __init__(self, path: str | pathlib.Path, by: str = "recent"):
+        if by not in MODES:
+            raise ValueError(f"Unknown rotation mode '{by}', expected one of {', '.join(MODES)}")
+        self.path = pathlib.Path(path)
+        self.by = by
+        self.raid = None
+        self.seq = None
+        self._db = None
+        # job -> heap of (priority, name) entries. Entries whose priority is out of date are skipped.
+        self._heaps = {}
+        # (job, name) -> (picks, last raid seq)
+        self._stats = {}
+
+    def __getstate__(self):
+        # --jobs workers open their own connection, and read the ledger as the parent left it.
+        return {"path": self.path, "by": self.by, "raid": self.raid, "seq": self.seq, "_db": None, "_heaps": {}, "_stats": {}}
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path, timeout=30)
+            self._db.executescript(SCHEMA)
+            if self._db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rotation_picks'").fetchone():
+                self._db.executescript(f"BEGIN; {MIGRATE_PICKS} COMMIT;")
+        return self._db
+
+    def begin(self, raid: str) -> None:
+        """Start picking for a raid, forgetting any picks made for it before."""
+        with self.db as db:
+            db.execute(
+                "INSERT OR IGNORE INTO rotation_raids VALUES (?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM rotation_raids))",
+                (raid,),
+            )
+            if db.execute("DELETE FROM rotation_turns WHERE raid = ?", (raid,)).rowcount:
+                self._heaps.clear()
+                self._stats.clear()
+        self.raid = raid
+        self.seq = self.db.execute("SELECT seq FROM rotation_raids WHERE raid = ?", (raid,)).fetchone()[0]
+
+    def _priority(self, job: str, name: str) -> tuple:
+        picks, last = self._stats.get((job, name), (0, 0))
+        return (last, picks, name) if self.by == "recent" else (picks, last, name)
+
+    def _heap(self, job: str, names: list[str]) -> list:
+        heap = self._heaps.get(job)
+        if heap is None:
+            for name, picks, last in self.db.execute("SELECT name, picks, last_seq FROM rotation_stats WHERE job = ?", (job,)):
+                self._stats[job, name] = (picks, last)
+            heap = self._heaps[job] = []
+            known = {name for j, name in self._stats if j == job}
+            heap.extend(self._priority(job, name) for name in known)
+            heapq.heapify(heap)
+        for name in names:
+            if (job, name) not in self._stats:
+                self._stats[job, name] = (0, 0)
+                heapq.heappush(heap, self._priority(job, name))
+        return heap
+
+    def pick(self, job: str, names: list[str]) -> str | None:
+        """The name whose turn it is to do job, recording that they did it in this raid."""
+        if not names:
+            return None
+        heap = self._heap(job, names)
+        wanted = set(names)
+        passed = []
+        chosen = None
+        while heap:
+            entry = heapq.heappop(heap)
+            if entry != self._priority(job, entry[-1]):
+                continue
+            if entry[-1] in wanted:
+                chosen = entry[-1]
+                break
+            passed.append(entry)
+        for entry in passed:
+            heapq.heappush(heap, entry)
+
+        picks, _ = self._stats[job, chosen]
+        self._stats[job, chosen] = (picks + 1, self.seq)
+        heapq.heappush(heap, self._priority(job, chosen))
+        with self.db as db:
+            db.execute("INSERT INTO rotation_turns VALUES (?, ?, ?, ?)", (self.raid, job, chosen, self.seq))
+        return chosen
+
+    def order(self, job: str, names: list[str]) -> list[str]:
+        """names in turn order: position 1 goes to whoever's turn it is for job/1,
+        position 2 to whoever's turn it is for job/2 from the rest, and so on."""
+        remaining = list(names)
+        ordered = []
+        for position in range(1, len(names) + 1):
+            name = self.pick(f"{job}/{position}", remaining)
+            remaining.remove(name)
+            ordered.append(name)
+        return ordered
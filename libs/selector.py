@@ -0,0 +1,169 @@
+"""Pick players out of lists of candidates, for the first() ... fifth(), nth(),
+random(), weighted() and randomList() template helpers.
+
+A Selector belongs to one raid. Candidates are names or players; names are
+looked up in the raid once, and the result of every call is remembered for
+the arguments it was called with, so templates asking the same question get
+the answer without another lookup.
+
+Random picks come from generators seeded with the Selector's seed, the call
+site (the template and which call of the helper in it it is) and the
+arguments, so a call picks the same player whenever it is rendered in a run,
+whichever --jobs worker renders it, while different calls pick
+independently. With a Rotation (generate.py --fair), random() and
+randomList() take turns instead, see libs/rotation.py."""
+
+import random
+from .players import GameClass, Player
+from . import deps, errorlog
+
+ORDINALS = ("first", "second", "third", "fourth", "fifth")
+MISSING_PLAYER = "MISSING_PLAYER"
+
+
+def _candidates(players: tuple) -> tuple:
+    """Helpers take candidates as arguments, or a single list of them."""
+    if players and isinstance(players[0], list):
+        return tuple(players[0])
+    return players
+
+
+class Selector:
+    def __init__(self, raid, seed: int = None, rotation=None):
+        self.raid = raid
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.rotation = rotation
+        # name -> Player, or None if they aren't in the raid.
+        self._players = {}
+        # (helper, arguments) -> (result, names looked up to get it)
+        self._results = {}
+        # (GameClass, job) -> the class's players in a random or turn order, see pool.
+        self._pools = {}
+
+    def _lookup(self, name: str, looked_up: list[str]) -> Player | None:
+        looked_up.append(name)
+        try:
+            return self._players[name]
+        except KeyError:
+            player = self._players[name] = self.raid.getplayer_by_name(name, errors=False)
+            return player
+
+    def _present(self, candidates: tuple, looked_up: list[str]) -> list[Player]:
+        """The candidates who are in the raid, in order. Players are always taken as they are."""
+        players = []
+        for candidate in candidates:
+            if isinstance(candidate, Player):
+                players.append(candidate)
+            elif isinstance(candidate, str):
+                player = self._lookup(candidate, looked_up)
+                if player:
+                    players.append(player)
+        return players
+
+    def _remember(self, key, compute):
+        """compute(looked_up) once per key. The name lookups it made are recorded again
+        on every call, so --incremental sees them from each template that asks."""
+        try:
+            entry = self._results[key]
+        except TypeError:
+            return compute([])
+        except KeyError:
+            looked_up = []
+            entry = self._results[key] = (compute(looked_up), looked_up)
+        result, looked_up = entry
+        for name in looked_up:
+            deps.record_roster("getplayer_by_name", (name,), {"errors": False}, self._players[name])
+        return result
+
+    def _rng(self, *key) -> random.Random:
+        return random.Random(repr((self.seed, *key)))
+
+    def nth(self, k: int, *players: Player | str | list[Player | str], errors: bool = True) -> Player:
+        """The first player in the raid from the k-th candidate on (k starts at 1)."""
+        candidates = _candidates(players)
+
+        def compute(looked_up):
+            for candidate in candidates[k - 1 :]:
+                if isinstance(candidate, Player):
+                    return candidate
+                if isinstance(candidate, str):
+                    player = self._lookup(candidate, looked_up)
+                    if player:
+                        return player
+            return None
+
+        player = self._remember(("nth", k, candidates), compute)
+        if player is None:
+            if errors:
+                if k <= len(ORDINALS):
+                    errorlog.add("{}{} was called, but none of those people are in the raid", ORDINALS[k - 1], players, code=errorlog.NO_MATCH)
+                else:
+                    errorlog.add("nth{} was called, but none of those people are in the raid", (k, *players), code=errorlog.NO_MATCH)
+            return MISSING_PLAYER
+        return player
+
+    def random(self, *players: Player | str | list[Player | str], errors: bool = True, job: str = None, site: str = None) -> Player:
+        """A random player in the raid from the candidates, picked once per call site. With a
+        rotation, whoever's turn it is to do job."""
+        deps.mark_volatile()
+        candidates = _candidates(players)
+
+        def compute(looked_up):
+            present = self._present(candidates, looked_up)
+            if present and self.rotation and job:
+                by_name = {str(x): x for x in reversed(present)}
+                return by_name[self.rotation.pick(job, list(by_name))]
+            return self._rng("random", site, *[str(x) for x in present]).choice(present) if present else None
+
+        player = self._remember(("random", site, job if self.rotation else None, candidates), compute)
+        if player is None:
+            if errors:
+                errorlog.add(
+                    "random{} was called, but none of those people are in the raid",
+                    players[0] if candidates is not players else players,
+                    code=errorlog.NO_MATCH,
+                )
+            return MISSING_PLAYER
+        return player
+
+    def weighted(self, weights: dict[Player | str, float], errors: bool = True, site: str = None) -> Player:
+        """A random player in the raid from the keys of weights, picked in proportion to their
+        weights, once per call site."""
+        deps.mark_volatile()
+        items = tuple(weights.items())
+
+        def compute(looked_up):
+            present = [(p, w) for c, w in items if w > 0 for p in self._present((c,), looked_up)]
+            if not present:
+                return None
+            rng = self._rng("weighted", site, *[(str(p), w) for p, w in present])
+            return rng.choices([p for p, _ in present], weights=[w for _, w in present])[0]
+
+        player = self._remember(("weighted", site, items), compute)
+        if player is None:
+            if errors:
+                errorlog.add("weighted({}) was called, but none of those people are in the raid", weights, code=errorlog.NO_MATCH)
+            return MISSING_PLAYER
+        return player
+
+    def pool(self, gameclass: GameClass | str, job: str = None) -> list[Player]:
+        """The players of a class in a random order that stays the same for the whole run.
+        Only classes that are asked for are shuffled. With a rotation, they are in turn
+        order for job, randomList:CLASS by default."""
+        deps.mark_volatile()
+        try:
+            gc = GameClass(gameclass.upper())
+        except (AttributeError, ValueError):
+            return []
+        if self.rotation:
+            job = job or f"randomList:{gc.value}"
+        key = (gc, job if self.rotation else None)
+        players = self._pools.get(key)
+        if players is None:
+            players = self._pools[key] = self.raid.getplayers(gc)
+            if self.rotation:
+                by_name = {str(x): x for x in reversed(players)}
+                players[:] = [by_name[x] for x in self.rotation.order(job, list(by_name))]
+            else:
+                self._rng("pool", gc.value).shuffle(players)
+        return list(players)
@@ -0,0 +1,135 @@
+"""A local HTTP server for generate.py --serve.
+
+POST a Raid-Helper export to /render and get back the MRTNoteImporter JSON
+for it, with the number of errors in the X-Errors header (add ?errors=1 to
+get {"notes": ..., "errors": [...]} instead). GET /stats returns how many
+requests were served and their p50/p99 latency. Requests are handled on
+threads, and handed to the render function, which does the actual work in a
+pool of processes."""
+
+import collections
+import http.server
+import json
+import math
+import threading
+import time
+import urllib.parse
+
+# Requests bigger than this are refused.
+MAX_BODY = 16 * 1024 * 1024
+# How many of the latest requests the latency percentiles are taken over.
+WINDOW = 10000
+
+
+class Latencies:
+    """Request latencies, for /stats."""
+
+    def __init__(self, window: int = WINDOW):
+        self.lock = threading.Lock()
+        self.recent = collections.deque(maxlen=window)
+        self.requests = 0
+        self.failed = 0
+
+    def add(self, seconds: float, ok: bool = True) -> None:
+        with self.lock:
+            self.recent.append(seconds)
+            self.requests += 1
+            self.failed += not ok
+
+    @staticmethod
+    def percentile(p: float, ordered: list[float]) -> float | None:
+        """The nearest rank percentile of sorted latencies."""
+        if not ordered:
+            return None
+        return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+    def to_json(self) -> dict:
+        with self.lock:
+            ordered = sorted(self.recent)
+            requests, failed = self.requests, self.failed
+        ms = lambda x: None if x is None else round(x * 1000, 3)
+        return {
+            "requests": requests,
+            "failed": failed,
+            "p50_ms": ms(self.percentile(50, ordered)),
+            "p99_ms": ms(self.percentile(99, ordered)),
+            "max_ms": ms(ordered[-1] if ordered else None),
+            "mean_ms": ms(sum(ordered) / len(ordered) if ordered else None),
+        }
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    # Set by make_server.
+    render = None
+    latencies = None
+    info = {}
+
+    def send(self, status: int, body: bytes, headers: dict = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def error(self, status: int, message: str) -> None:
+        self.send(status, json.dumps({"error": message}).encode())
+
+    def do_GET(self):
+        path = urllib.parse.urlsplit(self.path).path
+        if path == "/stats":
+            self.send(200, json.dumps({**self.info, **self.latencies.to_json()}).encode())
+        else:
+            self.error(404, f"No such page {path}, POST a Raid-Helper export to /render or GET /stats.")
+
+    def do_POST(self):
+        url = urllib.parse.urlsplit(self.path)
+        if url.path not in ("/", "/render"):
+            self.error(404, f"No such page {url.path}, POST a Raid-Helper export to /render.")
+            return
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            self.error(411, "Content-Length is required.")
+            return
+        if length > MAX_BODY:
+            self.error(413, f"The export is bigger than {MAX_BODY} bytes.")
+            return
+
+        started = time.perf_counter()
+        body = self.rfile.read(length)
+        try:
+            notes, errors = self.render(body)
+        except (ValueError, KeyError, TypeError) as e:
+            self.latencies.add(time.perf_counter() - started, ok=False)
+            self.error(400, f"Not a Raid-Helper export ({e!r}).")
+            return
+        except Exception as e:
+            self.latencies.add(time.perf_counter() - started, ok=False)
+            self.error(500, f"Could not render the notes: {e!r}")
+            return
+
+        if "errors" in urllib.parse.parse_qs(url.query, keep_blank_values=True):
+            response = f'{{"notes": {notes}, "errors": {json.dumps(errors)}}}'
+        else:
+            response = notes
+        self.latencies.add(time.perf_counter() - started)
+        self.send(200, response.encode(), {"X-Errors": str(len(errors))})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(address: tuple[str, int], render, info: dict = None) -> http.server.ThreadingHTTPServer:
+    """A server that answers POST /render with render(body), which returns (notes JSON, errors)."""
+    handler = type("Handler", (Handler,), {"render": staticmethod(render), "latencies": Latencies(), "info": info or {}})
+    server = http.server.ThreadingHTTPServer(address, handler)
+    server.daemon_threads = True
+    return server
+
+
+def parse_address(value: str) -> tuple[str, int]:
+    """[HOST:]PORT, on localhost unless a host is given."""
+    host, _, port = value.rpartition(":")
+    return host or "127.0.0.1", int(port)
@@ -0,0 +1,54 @@
+"""Track how long generate.py takes to start, and which imports the time goes on.
+
+generate.py imports this module first, then imports heavy modules (jinja2,
+yaml, colorama) through timed_import() only when they are needed, so
+`generate.py --help` never pays for them."""
+
+import importlib
+import sys
+import time
+
+STARTED = time.perf_counter()
+
+# Module name -> seconds spent importing it through timed_import.
+import_times: dict[str, float] = {}
+# Label -> seconds since STARTED, see mark().
+marks: dict[str, float] = {}
+
+
+def timed_import(name: str):
+    """Import a module, recording how long it took if it wasn't already loaded."""
+    module = sys.modules.get(name)
+    if module is None:
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        import_times[name] = time.perf_counter() - start
+    return module
+
+
+def mark(label: str) -> None:
+    """Record how long after startup we reached label."""
+    marks[label] = time.perf_counter() - STARTED
+
+
+def import_cost() -> float:
+    """Seconds spent on top level imports plus every timed_import so far."""
+    return marks.get("imports", 0.0) + sum(import_times.values())
+
+
+def report(budget_ms: float = None) -> bool:
+    """Print the startup report. Returns False if import_cost() is over budget_ms."""
+    colorama = timed_import("colorama")
+    print("*** Startup report ***")
+    for label, seconds in marks.items():
+        print(f"{seconds * 1000:8.1f} ms  reached {label}")
+    for name, seconds in sorted(import_times.items(), key=lambda x: x[1], reverse=True):
+        print(f"{seconds * 1000:8.1f} ms  import {name}")
+    cost = import_cost() * 1000
+    print(f"{cost:8.1f} ms  total import cost")
+    if budget_ms is not None and cost > budget_ms:
+        print(
+            f"{colorama.Fore.RED}*** Import cost {cost:.1f} ms is over the budget of {budget_ms:g} ms ***{colorama.Style.RESET_ALL}"
+        )
+        return False
+    return True
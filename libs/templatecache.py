@@ -0,0 +1,130 @@
+"""On-disk cache of compiled templates, for jinja2.Environment(bytecode_cache=...).
+
+Entries are keyed by a hash of the preprocessed template source and the
+environment settings that affect compilation, so an unchanged template is
+never compiled twice, whichever path it was loaded from. The cache directory
+is kept under a size limit by removing the least recently used entries."""
+
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+import jinja2
+from jinja2.bccache import Bucket
+
+SUFFIX = ".jinjac"
+NAMES_SUFFIX = ".names"
+
+
+def fingerprint(environment: jinja2.Environment) -> str:
+    """The environment settings that change what a template compiles to."""
+    return repr(
+        (
+            jinja2.__version__,
+            environment.block_start_string,
+            environment.block_end_string,
+            environment.variable_start_string,
+            environment.variable_end_string,
+            environment.comment_start_string,
+            environment.comment_end_string,
+            environment.line_statement_prefix,
+            environment.line_comment_prefix,
+            environment.trim_blocks,
+            environment.lstrip_blocks,
+            environment.newline_sequence,
+            environment.keep_trailing_newline,
+            environment.optimized,
+            environment.is_async,
+            sorted(environment.extensions),
+        )
+    )
+
+
+class TemplateCache(jinja2.BytecodeCache):
+    def __init__(self, directory: str | pathlib.Path, max_bytes: int = 64 * 1024 * 1024):
+        self.directory = pathlib.Path(directory)
+        self.max_bytes = max_bytes
+        self._fingerprints = {}
+        # path -> (last used, size) of every entry, read on the first write.
+        self._entries = None
+
+    def _path(self, key: str) -> pathlib.Path:
+        return self.directory / f"{key}{SUFFIX}"
+
+    def key(self, environment: jinja2.Environment, source: str) -> str:
+        env_fingerprint = self._fingerprints.get(id(environment))
+        if env_fingerprint is None:
+            env_fingerprint = self._fingerprints[id(environment)] = fingerprint(environment)
+        return hashlib.sha256(f"{env_fingerprint}\0{source}".encode()).hexdigest()
+
+    def get_bucket(self, environment, name, filename, source) -> Bucket:
+        key = self.key(environment, source)
+        bucket = Bucket(environment, key, key)
+        self.load_bytecode(bucket)
+        return bucket
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        path = self._path(bucket.key)
+        try:
+            with open(path, "rb") as f:
+                bucket.load_bytecode(f)
+            os.utime(path)
+        except OSError:
+            return
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        path = self._path(bucket.key)
+        if self._write(path, bucket.write_bytecode):
+            self._track(path)
+
+    def load_names(self, key: str) -> dict | None:
+        """The names found in a template by generate.parse_names, if cached."""
+        try:
+            return json.loads((self.directory / f"{key}{NAMES_SUFFIX}").read_text())
+        except (OSError, ValueError):
+            return None
+
+    def dump_names(self, key: str, names: dict) -> None:
+        path = self.directory / f"{key}{NAMES_SUFFIX}"
+        if self._write(path, lambda f: f.write(json.dumps(names).encode())):
+            self._track(path)
+
+    def _write(self, path: pathlib.Path, write) -> bool:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp, path)
+        except OSError:
+            pathlib.Path(tmp).unlink(missing_ok=True)
+            return False
+        return True
+
+    def _entry_paths(self):
+        return [*self.directory.glob(f"*{SUFFIX}"), *self.directory.glob(f"*{NAMES_SUFFIX}")]
+
+    def _track(self, path: pathlib.Path) -> None:
+        if self._entries is None:
+            self._entries = {}
+            for entry in self._entry_paths():
+                stat = entry.stat()
+                self._entries[entry] = (stat.st_mtime, stat.st_size)
+        stat = path.stat()
+        self._entries[path] = (stat.st_mtime, stat.st_size)
+        self._evict()
+
+    def _evict(self) -> None:
+        total = sum(size for _, size in self._entries.values())
+        for path, (_, size) in sorted(self._entries.items(), key=lambda x: x[1][0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            del self._entries[path]
+            total -= size
+
+    def clear(self) -> None:
+        for entry in self._entry_paths():
+            entry.unlink(missing_ok=True)
+        self._entries = None
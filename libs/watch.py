@@ -0,0 +1,28 @@
+"""Poll files for changes, for generate.py --watch."""
+
+import os
+import pathlib
+import time
+
+
+def snapshot(paths: list[pathlib.Path]) -> dict[pathlib.Path, tuple[int, int]]:
+    """(mtime, size) of each path that exists."""
+    stats = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        stats[path] = (stat.st_mtime_ns, stat.st_size)
+    return stats
+
+
+def wait_for_changes(list_paths, previous: dict, interval: float = 0.05):
+    """Block until a path returned by list_paths() is added, removed or modified.
+    Returns (changed paths, new snapshot)."""
+    while True:
+        time.sleep(interval)
+        current = snapshot(list_paths())
+        if current != previous:
+            changed = {path for path in current.keys() | previous.keys() if current.get(path) != previous.get(path)}
+            return changed, current